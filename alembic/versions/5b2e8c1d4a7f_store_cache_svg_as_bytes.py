@@ -0,0 +1,28 @@
+"""Store cache SVG as bytes
+
+Revision ID: 5b2e8c1d4a7f
+Revises: 3914ac77de9b
+Create Date: 2025-10-02 10:14:27.381245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8c1d4a7f'
+down_revision: Union[str, Sequence[str], None] = '3914ac77de9b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cache', sa.Column('svg', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('cache', 'svg')
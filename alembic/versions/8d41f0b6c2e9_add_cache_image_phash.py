@@ -0,0 +1,30 @@
+"""Add cache image pHash
+
+Revision ID: 8d41f0b6c2e9
+Revises: 5b2e8c1d4a7f
+Create Date: 2025-10-03 16:42:08.114903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41f0b6c2e9'
+down_revision: Union[str, Sequence[str], None] = '5b2e8c1d4a7f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cache', sa.Column('image_phash', sa.BigInteger(), nullable=True))
+    op.create_index(op.f('ix_cache_image_phash'), 'cache', ['image_phash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_cache_image_phash'), table_name='cache')
+    op.drop_column('cache', 'image_phash')
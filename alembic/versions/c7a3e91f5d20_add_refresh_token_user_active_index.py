@@ -0,0 +1,31 @@
+"""Add refresh token user/active index
+
+Revision ID: c7a3e91f5d20
+Revises: 8d41f0b6c2e9
+Create Date: 2025-10-06 10:15:32.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a3e91f5d20'
+down_revision: Union[str, Sequence[str], None] = '8d41f0b6c2e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_refresh_tokens_user_active', 'refresh_tokens', ['user_id', 'is_revoked', 'expires_at'], unique=False)
+    # The composite index's user_id prefix makes the single-column one redundant
+    op.drop_index(op.f('ix_refresh_tokens_user_id'), table_name='refresh_tokens')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_refresh_tokens_user_id'), 'refresh_tokens', ['user_id'], unique=False)
+    op.drop_index('ix_refresh_tokens_user_active', table_name='refresh_tokens')
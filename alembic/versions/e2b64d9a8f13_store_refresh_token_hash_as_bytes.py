@@ -0,0 +1,51 @@
+"""Store refresh token hash as bytes
+
+Revision ID: e2b64d9a8f13
+Revises: c7a3e91f5d20
+Create Date: 2025-10-07 09:42:18.553914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b64d9a8f13'
+down_revision: Union[str, Sequence[str], None] = 'c7a3e91f5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _convert(source: str, target: str, convert) -> None:
+    """Copy token hashes between columns, converting each value in Python."""
+    tokens = sa.table('refresh_tokens', sa.column('id'), sa.column(source), sa.column(target))
+    conn = op.get_bind()
+    rows = conn.execute(sa.select(tokens.c.id, tokens.c[source])).all()
+    for token_id, value in rows:
+        conn.execute(
+            tokens.update().where(tokens.c.id == token_id).values({target: convert(value)})
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('token_hash_bin', sa.LargeBinary(length=32), nullable=True))
+    _convert('token_hash', 'token_hash_bin', bytes.fromhex)
+    op.drop_index(op.f('ix_refresh_tokens_token_hash'), table_name='refresh_tokens')
+    with op.batch_alter_table('refresh_tokens') as batch_op:
+        batch_op.drop_column('token_hash')
+        batch_op.alter_column('token_hash_bin', new_column_name='token_hash', nullable=False)
+    op.create_index(op.f('ix_refresh_tokens_token_hash'), 'refresh_tokens', ['token_hash'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('token_hash_hex', sa.String(length=255), nullable=True))
+    _convert('token_hash', 'token_hash_hex', bytes.hex)
+    op.drop_index(op.f('ix_refresh_tokens_token_hash'), table_name='refresh_tokens')
+    with op.batch_alter_table('refresh_tokens') as batch_op:
+        batch_op.drop_column('token_hash')
+        batch_op.alter_column('token_hash_hex', new_column_name='token_hash', nullable=False)
+    op.create_index(op.f('ix_refresh_tokens_token_hash'), 'refresh_tokens', ['token_hash'], unique=True)
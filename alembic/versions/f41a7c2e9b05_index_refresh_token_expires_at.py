@@ -0,0 +1,28 @@
+"""Index refresh token expires_at
+
+Revision ID: f41a7c2e9b05
+Revises: e2b64d9a8f13
+Create Date: 2025-10-07 14:06:51.227340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f41a7c2e9b05'
+down_revision: Union[str, Sequence[str], None] = 'e2b64d9a8f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_refresh_tokens_expires_at'), 'refresh_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refresh_tokens_expires_at'), table_name='refresh_tokens')
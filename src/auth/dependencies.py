@@ -2,7 +2,7 @@
 Authentication dependencies for FastAPI.
 """
 
-from typing import Optional
+from typing import Optional, Union
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from src.core.database import SessionDep
@@ -13,19 +13,18 @@ from src.core.utils import logger
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
+# Same scheme without the automatic 403, for resolving optional credentials
+optional_security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    auth_service: AuthService = Depends(get_auth_service)
-) -> User:
-    """Get current authenticated user from JWT token."""
+async def _authenticate_token(token: str, auth_service: AuthService) -> User:
+    """Verify a bearer token and load its active user."""
     try:
         # Verify token
-        payload = verify_token(credentials.credentials)
+        payload = verify_token(token)
         user_id = int(payload.get("sub"))
         
-        # Get user from database
+        # Get user (served from the shared Redis user cache when warm)
         user = await auth_service.get_user_by_id(user_id)
         if not user:
             raise HTTPException(
@@ -54,6 +53,36 @@ async def get_current_user(
         )
 
 
+async def resolve_request_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    auth_service: AuthService = Depends(get_auth_service)
+) -> Union[User, HTTPException, None]:
+    """
+    Authenticate the request's bearer token, once per request.
+    
+    Returns None without credentials, or the HTTPException explaining why the
+    token was rejected. Required and optional user dependencies both build on
+    this, so FastAPI's per-request dependency cache shares one verification.
+    """
+    if not credentials:
+        return None
+    try:
+        return await _authenticate_token(credentials.credentials, auth_service)
+    except HTTPException as e:
+        return e
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    resolved: Union[User, HTTPException] = Depends(resolve_request_user)
+) -> User:
+    """Get current authenticated user from JWT token."""
+    # `security` rejects requests without credentials, so resolved is set
+    if isinstance(resolved, HTTPException):
+        raise resolved
+    return resolved
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -79,17 +108,10 @@ async def get_current_superuser(
 
 
 async def get_optional_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    auth_service: AuthService = Depends(get_auth_service)
+    resolved: Union[User, HTTPException, None] = Depends(resolve_request_user)
 ) -> Optional[User]:
     """Get current user if authenticated, otherwise return None."""
-    if not credentials:
-        return None
-    
-    try:
-        return await get_current_user(credentials, auth_service)
-    except HTTPException:
-        return None
+    return resolved if isinstance(resolved, User) else None
 
 
 # Permission decorators
@@ -4,7 +4,7 @@ Authentication models for user management.
 
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index, LargeBinary
 from sqlalchemy.sql import func
 from src.core.models import Base
 
@@ -26,15 +26,17 @@ class User(Base):
     
     def to_dict(self) -> dict:
         """Convert user instance to dictionary."""
+        # Read each instrumented timestamp attribute once
+        created_at, updated_at, last_login = self.created_at, self.updated_at, self.last_login
         return {
             "id": self.id,
             "username": self.username,
             "email": self.email,
             "is_active": self.is_active,
             "is_superuser": self.is_superuser,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "last_login": self.last_login.isoformat() if self.last_login else None
+            "created_at": created_at and created_at.isoformat(),
+            "updated_at": updated_at and updated_at.isoformat(),
+            "last_login": last_login and last_login.isoformat()
         }
     
     def __repr__(self) -> str:
@@ -47,22 +49,30 @@ class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, nullable=False, index=True)
-    token_hash = Column(String(255), unique=True, nullable=False, index=True)
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    user_id = Column(Integer, nullable=False)
+    token_hash = Column(LargeBinary(32), unique=True, nullable=False, index=True)
+    # Indexed so the expired-token sweep is a range scan, not a full scan
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
     is_revoked = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     revoked_at = Column(DateTime(timezone=True), nullable=True)
     
+    __table_args__ = (
+        # Serves the per-user active-token scans in revocation and cleanup; its user_id
+        # prefix also covers plain per-user lookups
+        Index("ix_refresh_tokens_user_active", "user_id", "is_revoked", "expires_at"),
+    )
+    
     def to_dict(self) -> dict:
         """Convert refresh token instance to dictionary."""
+        expires_at, created_at, revoked_at = self.expires_at, self.created_at, self.revoked_at
         return {
             "id": self.id,
             "user_id": self.user_id,
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "expires_at": expires_at and expires_at.isoformat(),
             "is_revoked": self.is_revoked,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "revoked_at": self.revoked_at.isoformat() if self.revoked_at else None
+            "created_at": created_at and created_at.isoformat(),
+            "revoked_at": revoked_at and revoked_at.isoformat()
         }
     
     def __repr__(self) -> str:
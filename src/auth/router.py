@@ -2,9 +2,12 @@
 Authentication router for user registration, login, and token management.
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends, Request
-from src.core.database import SessionDep
-from src.auth.service import AuthService, get_auth_service
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Query
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from src.core.database import SessionDep, db_manager
+from src.auth.service import AuthService, get_auth_service, invalidate_user_cache
 from src.auth.schemas import (
     UserCreate, UserLogin, UserResponse, TokenResponse, 
     TokenRefresh, PasswordChange, UserUpdate
@@ -12,10 +15,17 @@ from src.auth.schemas import (
 from src.auth.dependencies import get_current_user, get_current_superuser
 from src.auth.models import User
 from src.core.utils import log_request, log_response, logger
-from src.middleware.rate_limiting import auth_rate_limit, api_rate_limit, admin_rate_limit
+from src.middleware.rate_limiting import (
+    auth_rate_limit, api_rate_limit, admin_rate_limit, token_bucket_rate_limit
+)
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# Validates and serializes a batch of users in one pass
+_USER_LIST_ADAPTER = TypeAdapter(list[UserResponse])
+# Rows fetched, validated and sent per chunk when streaming the user list
+_USER_LIST_BATCH_SIZE = 500
+
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 @auth_rate_limit()
@@ -30,7 +40,7 @@ async def register_user(
     try:
         user = await auth_service.create_user(user_data)
         response = UserResponse(**user.to_dict())
-        log_response(request, response.dict())
+        log_response(request, response)
         return response
         
     except HTTPException:
@@ -44,7 +54,7 @@ async def register_user(
 
 
 @router.post("/login", response_model=TokenResponse)
-@auth_rate_limit()
+@token_bucket_rate_limit("login")
 async def login_user(
     login_data: UserLogin,
     request: Request,
@@ -87,7 +97,7 @@ async def login_user(
 
 
 @router.post("/refresh", response_model=TokenResponse)
-@auth_rate_limit()
+@token_bucket_rate_limit("refresh")
 async def refresh_token(
     token_data: TokenRefresh,
     request: Request,
@@ -177,20 +187,21 @@ async def update_current_user(
         if not update_data:
             return UserResponse(**current_user.to_dict())
         
-        # Update user in database
+        # Update user in database, reading the new row back in the same statement
         from sqlalchemy import update
-        await auth_service.session.execute(
+        result = await auth_service.session.execute(
             update(User)
             .where(User.id == current_user.id)
             .values(**update_data)
+            .returning(User)
         )
+        updated_user = result.scalar_one()
         await auth_service.session.commit()
+        await invalidate_user_cache(current_user.id)
         
-        # Get updated user
-        updated_user = await auth_service.get_user_by_id(current_user.id)
         response = UserResponse(**updated_user.to_dict())
         
-        log_response(request, response.dict())
+        log_response(request, response)
         return response
         
     except Exception as e:
@@ -212,25 +223,25 @@ async def change_password(
     log_request(request, {"user_id": current_user.id})
     
     try:
-        # Verify current password
-        if not auth_service.verify_password(password_data.current_password, current_user.hashed_password):
+        # Verify current password; the hash isn't cached, so read it directly
+        hashed_password = await auth_service.get_hashed_password(current_user.id)
+        if not hashed_password or not await auth_service.verify_password(password_data.current_password, hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect"
             )
         
-        # Update password
-        new_hashed_password = auth_service.get_password_hash(password_data.new_password)
+        # Update password and revoke all user tokens in one transaction
+        new_hashed_password = await auth_service.get_password_hash(password_data.new_password)
         from sqlalchemy import update
         await auth_service.session.execute(
             update(User)
             .where(User.id == current_user.id)
             .values(hashed_password=new_hashed_password)
         )
+        await auth_service.revoke_all_user_tokens(current_user.id, flush_only=True)
         await auth_service.session.commit()
-        
-        # Revoke all user tokens
-        await auth_service.revoke_all_user_tokens(current_user.id)
+        await invalidate_user_cache(current_user.id)
         
         response = {"message": "Password changed successfully"}
         log_response(request, response)
@@ -250,27 +261,66 @@ async def change_password(
 @admin_rate_limit()
 async def list_users(
     request: Request,
-    current_user: User = Depends(get_current_superuser),
-    auth_service: AuthService = Depends(get_auth_service)
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    current_user: User = Depends(get_current_superuser)
 ):
     """List all users (superuser only)."""
     log_request(request, {"user_id": current_user.id})
     
+    from sqlalchemy import select
+    query = (
+        select(User)
+        .order_by(User.id)
+        .offset(skip)
+        .limit(limit)
+        .execution_options(yield_per=_USER_LIST_BATCH_SIZE)
+    )
+    
+    # The request session is closed before a streamed body is sent, so the
+    # listing runs in its own session on a server-side cursor. The first
+    # batch is fetched up front so connection and query errors still get a 500.
+    session = db_manager.session_factory()
     try:
-        from sqlalchemy import select
-        result = await auth_service.session.execute(select(User))
-        users = result.scalars().all()
-        
-        response = [UserResponse(**user.to_dict()) for user in users]
-        log_response(request, {"count": len(response)})
-        return response
-        
+        result = await session.stream_scalars(query)
+        partitions = result.partitions()
+        first = await anext(partitions, None)
     except Exception as e:
+        await session.close()
         logger.error(f"List users error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to list users"
         )
+    
+    def encode(users) -> bytes:
+        chunk = _USER_LIST_ADAPTER.dump_json(
+            _USER_LIST_ADAPTER.validate_python(users, from_attributes=True)
+        )
+        return chunk[1:-1]
+    
+    async def stream_users():
+        if first is None:
+            await session.close()
+            yield b"[]"
+            log_response(request, {"count": 0})
+            return
+        count = len(first)
+        try:
+            yield b"[" + encode(first)
+            async for users in partitions:
+                yield b"," + encode(users)
+                count += len(users)
+        except Exception as e:
+            # Headers are already sent; aborting leaves the client a truncated body
+            logger.error(f"List users error: {e}")
+            raise
+        finally:
+            await session.close()
+        yield b"]"
+        log_response(request, {"count": count})
+    
+    return StreamingResponse(stream_users(), media_type="application/json")
 
 
 @router.delete("/users/{user_id}")
@@ -305,6 +355,7 @@ async def delete_user(
             delete(User).where(User.id == user_id)
         )
         await auth_service.session.commit()
+        await invalidate_user_cache(user_id)
         
         response = {"message": f"User {target_user.username} deleted successfully"}
         log_response(request, response)
@@ -2,10 +2,31 @@
 Authentication schemas for request/response validation.
 """
 
+import re
 from pydantic import BaseModel, EmailStr, Field, validator
 from typing import Optional
 from datetime import datetime
 
+# One C-level pass accepting the common case: 8+ chars with ASCII lower,
+# upper and digit. Anything else goes through the per-rule checks below
+_PASSWORD_OK = re.compile(r"(?=.*[a-z])(?=.*[A-Z])(?=.*\d).{8,}", re.DOTALL).match
+
+
+def password_strength_error(password: str) -> Optional[str]:
+    """Return why a password is too weak, or None if it is strong enough."""
+    if _PASSWORD_OK(password):
+        return None
+    # Also accepts non-ASCII cased letters and digits the fast path misses
+    if len(password) < 8:
+        return 'Password must be at least 8 characters long'
+    if not any(c.isupper() for c in password):
+        return 'Password must contain at least one uppercase letter'
+    if not any(c.islower() for c in password):
+        return 'Password must contain at least one lowercase letter'
+    if not any(c.isdigit() for c in password):
+        return 'Password must contain at least one digit'
+    return None
+
 
 class UserCreate(BaseModel):
     """Schema for user registration."""
@@ -21,14 +42,9 @@ class UserCreate(BaseModel):
     
     @validator('password')
     def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Password must contain at least one digit')
+        error = password_strength_error(v)
+        if error:
+            raise ValueError(error)
         return v
 
 
@@ -70,14 +86,9 @@ class PasswordChange(BaseModel):
     
     @validator('new_password')
     def validate_new_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Password must contain at least one digit')
+        error = password_strength_error(v)
+        if error:
+            raise ValueError(error)
         return v
 
 
@@ -2,18 +2,33 @@
 Security utilities for authentication and authorization.
 """
 
-import secrets
+import base64
 import hashlib
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import hmac
+import secrets
+import time
+import uuid
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Optional, Dict, Any, Tuple
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+import jwt
+import orjson
+from jwt import InvalidTokenError
 from fastapi import HTTPException, status
 from src.core.config import config
 from src.core.utils import logger
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context: Argon2id for new hashes; bcrypt hashes still
+# verify and are flagged for rehashing on the next successful login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated=["bcrypt"],
+    argon2__type="ID",
+    argon2__time_cost=config.auth.password_hash_time_cost,
+    argon2__memory_cost=config.auth.password_hash_memory_kib,
+    argon2__parallelism=config.auth.password_hash_parallelism,
+)
 
 # JWT settings
 SECRET_KEY = config.auth.secret_key
@@ -22,11 +37,41 @@ ACCESS_TOKEN_EXPIRE_MINUTES = config.auth.access_token_expire_minutes
 REFRESH_TOKEN_EXPIRE_DAYS = config.auth.refresh_token_expire_days
 
 
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url, as used by JWT segments."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# Tokens are only ever signed with HS256 and this key, so the encoded header
+# and the keyed HMAC state are built once and copied per token
+_JWT_HEADER = _b64url(b'{"alg":"HS256","typ":"JWT"}') + b"."
+_JWT_HMAC = hmac.new(SECRET_KEY.encode(), digestmod=hashlib.sha256)
+
+# Payloads of recently verified tokens, least recently used first. Only the
+# signature check and JSON decode are cached; type and expiry are still
+# checked on every call
+_DECODE_CACHE_MAXSIZE = 10_000
+_decode_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def _encode_jwt(payload: Dict[str, Any]) -> str:
+    """Sign a payload of JSON-native values as an HS256 JWT."""
+    signing_input = _JWT_HEADER + _b64url(orjson.dumps(payload))
+    mac = _JWT_HMAC.copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode("ascii")
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if its scheme or cost is outdated."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Hash a password."""
     return pwd_context.hash(password)
@@ -36,29 +81,44 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     """Create a JWT access token."""
     to_encode = data.copy()
     
+    # Integer unix timestamps, as JWT requires
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time() + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
     
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return _encode_jwt(to_encode)
 
 
 def create_refresh_token(data: Dict[str, Any]) -> str:
     """Create a JWT refresh token."""
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    now = int(time.time())
+    expire = now + REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+    # jti identifies the token for revocation
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex, "iat": now})
+    return _encode_jwt(to_encode)
+
+
+def _decode_token(token: str) -> Dict[str, Any]:
+    """Decode a JWT, reusing the result for tokens verified recently."""
+    payload = _decode_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        _decode_cache[token] = payload
+        if len(_decode_cache) > _DECODE_CACHE_MAXSIZE:
+            _decode_cache.popitem(last=False)
+    else:
+        _decode_cache.move_to_end(token)
+    # Callers get a copy so they can't mutate the cached claims
+    return dict(payload)
 
 
 def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
     """Verify and decode a JWT token."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_token(token)
         
         # Check token type
         if payload.get("type") != token_type:
@@ -70,7 +130,8 @@ def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
         
         # Check expiration
         exp = payload.get("exp")
-        if exp is None or datetime.utcnow() > datetime.fromtimestamp(exp):
+        if exp is None or time.time() >= exp:
+            _decode_cache.pop(token, None)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has expired",
@@ -79,7 +140,7 @@ def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
         
         return payload
         
-    except JWTError as e:
+    except InvalidTokenError as e:
         logger.error(f"JWT verification error: {e}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -88,9 +149,10 @@ def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
         )
 
 
-def generate_token_hash(token: str) -> str:
-    """Generate a hash for storing refresh tokens."""
-    return hashlib.sha256(token.encode()).hexdigest()
+def generate_token_hash(token: str) -> bytes:
+    """Generate a hash for storing refresh tokens (raw 32-byte SHA-256 digest)."""
+    # Also called on unverified client input (logout), so accept any text
+    return hashlib.sha256(token.encode("utf-8")).digest()
 
 
 def generate_random_string(length: int = 32) -> str:
@@ -101,9 +163,9 @@ def generate_random_string(length: int = 32) -> str:
 def create_password_reset_token(email: str) -> str:
     """Create a password reset token."""
     data = {"email": email, "purpose": "password_reset"}
-    expire = datetime.utcnow() + timedelta(hours=1)  # 1 hour expiry
+    expire = int(time.time()) + 60 * 60  # 1 hour expiry
     data.update({"exp": expire})
-    return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
+    return _encode_jwt(data)
 
 
 def verify_password_reset_token(token: str) -> str:
@@ -126,7 +188,7 @@ def verify_password_reset_token(token: str) -> str:
         
         return email
         
-    except JWTError as e:
+    except InvalidTokenError as e:
         logger.error(f"Password reset token verification error: {e}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -2,21 +2,155 @@
 Authentication service layer for user management and token operations.
 """
 
+import asyncio
+import functools
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from sqlalchemy import select, update, delete
+from typing import Optional, Dict, Any, Tuple
+import orjson
+from redis.exceptions import RedisError
+from sqlalchemy import select, update, delete, or_, case
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from fastapi import HTTPException, status, Depends
 from src.core.database import SessionDep
 from src.auth.models import User, RefreshToken
 from src.auth.schemas import UserCreate, UserLogin, TokenRefresh
 from src.auth.security import (
-    verify_password, get_password_hash, create_access_token, 
-    create_refresh_token, verify_token, generate_token_hash
+    verify_password, verify_and_update_password, get_password_hash, create_access_token, 
+    create_refresh_token, verify_token, generate_token_hash, REFRESH_TOKEN_EXPIRE_DAYS
 )
+from src.core.redis_client import redis_client, redis_available, mark_redis_down
 from src.core.utils import logger
-from src.core.exceptions import DatabaseError
+from src.core.exceptions import DatabaseError, InternalServerException
+
+# Cached user rows expire after this many seconds even if never invalidated
+USER_CACHE_TTL = 60
+# Columns cached per user; the password hash is deliberately left out, so
+# cached users have hashed_password=None (see get_hashed_password)
+_USER_CACHE_FIELDS = (
+    "id", "username", "email", "is_active", "is_superuser",
+    "created_at", "updated_at", "last_login"
+)
+_USER_CACHE_DATETIMES = ("created_at", "updated_at", "last_login")
+# Revocation state only needs to outlive the refresh tokens it covers
+_REVOCATION_TTL = REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
+
+def _user_cache_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def _user_from_cache(data: bytes) -> User:
+    """Rebuild a detached User from its cached JSON row."""
+    fields = orjson.loads(data)
+    for name in _USER_CACHE_DATETIMES:
+        if fields[name] is not None:
+            fields[name] = datetime.fromisoformat(fields[name])
+    return User(**fields)
+
+
+def cached_user(func):
+    """Serve an id -> User lookup from Redis, filling it from the wrapped query on a miss."""
+    @functools.wraps(func)
+    async def wrapper(self, user_id: int) -> Optional[User]:
+        if not redis_available():
+            return await func(self, user_id)
+        
+        key = _user_cache_key(user_id)
+        try:
+            data = await redis_client.get(key)
+            if data is not None:
+                return _user_from_cache(data)
+        except RedisError as e:
+            # Don't try to fill the cache either; that would wait out a second timeout
+            logger.debug(f"User cache unavailable: {e}")
+            mark_redis_down()
+            return await func(self, user_id)
+        
+        user = await func(self, user_id)
+        if user is not None:
+            row = orjson.dumps({name: getattr(user, name) for name in _USER_CACHE_FIELDS})
+            try:
+                await redis_client.setex(key, USER_CACHE_TTL, row)
+            except RedisError as e:
+                logger.debug(f"User cache unavailable: {e}")
+                mark_redis_down()
+        return user
+    return wrapper
+
+
+# Last-login times waiting for the next batched write, latest per user
+LAST_LOGIN_FLUSH_INTERVAL = 5.0
+_pending_last_logins: Dict[int, datetime] = {}
+
+
+def record_last_login(user_id: int) -> None:
+    """Queue a user's last-login timestamp for the next batch."""
+    _pending_last_logins[user_id] = datetime.utcnow()
+
+
+async def flush_last_logins(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Write all queued last-login timestamps in a single UPDATE."""
+    if not _pending_last_logins:
+        return
+    # No await between copy and clear, so no login can slip in between
+    pending = dict(_pending_last_logins)
+    _pending_last_logins.clear()
+    
+    try:
+        async with session_factory() as session:
+            await session.execute(
+                update(User)
+                .where(User.id.in_(pending))
+                .values(last_login=case(pending, value=User.id))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+    except asyncio.CancelledError:
+        # Cancelled mid-write (shutdown); keep the batch for the final flush
+        _requeue_last_logins(pending)
+        raise
+    except Exception as e:
+        # Driver connection errors (e.g. OSError from asyncpg) aren't wrapped
+        # in SQLAlchemyError; none of them may kill the flusher
+        logger.error(f"Error flushing last logins: {e}")
+        _requeue_last_logins(pending)
+
+
+def _requeue_last_logins(pending: Dict[int, datetime]) -> None:
+    """Put an unwritten batch back, unless a newer login was recorded meanwhile."""
+    for user_id, last_login in pending.items():
+        _pending_last_logins.setdefault(user_id, last_login)
+
+
+async def run_last_login_flusher(session_factory: async_sessionmaker[AsyncSession],
+                                 interval: float = LAST_LOGIN_FLUSH_INTERVAL) -> None:
+    """Flush queued last-login timestamps every interval seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        await flush_last_logins(session_factory)
+
+
+async def invalidate_user_cache(user_id: int) -> None:
+    """Drop a user's cached row after their account changes."""
+    try:
+        await redis_client.delete(_user_cache_key(user_id))
+    except RedisError as e:
+        logger.warning(f"Failed to invalidate cached user {user_id}: {e}")
+
+
+def _revocation_key(user_id: int) -> str:
+    """
+    Redis hash holding a user's refresh token revocation state.
+    
+    Fields: "gen", a random id fixed when the hash is created; "ver", bumped
+    by every revoke-all; and "jti:<id>" for each revoked token. Tokens record
+    the gen and ver they were issued under, so a hash lost to a flush,
+    restart or eviction (missing, or recreated with a new gen) is detected
+    and those tokens fall back to the database check.
+    """
+    return f"revocation:{user_id}"
 
 
 class AuthService:
@@ -26,28 +160,44 @@ class AuthService:
         """Initialize auth service with session dependency."""
         self.session = session
     
+    # ========== PASSWORD HASHING ==========
+    # Hashing is deliberately slow and CPU-bound; run it on a worker thread
+    # (the hash backends release the GIL) so other requests keep being served
+    
+    async def get_password_hash(self, password: str) -> str:
+        """Hash a password off the event loop."""
+        return await asyncio.to_thread(get_password_hash, password)
+    
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash off the event loop."""
+        return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+    
     # ========== USER MANAGEMENT METHODS ==========
     
     async def create_user(self, user_data: UserCreate) -> User:
         """Create a new user."""
         try:
-            # Check if user already exists
-            existing_user = await self.get_user_by_username(user_data.username)
-            if existing_user:
+            # Check username and email uniqueness in one round trip; up to
+            # two different users can match
+            result = await self.session.execute(
+                select(User.username, User.email).where(
+                    or_(User.username == user_data.username, User.email == user_data.email)
+                )
+            )
+            existing = result.all()
+            if any(row.username == user_data.username for row in existing):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Username already registered"
                 )
-            
-            existing_email = await self.get_user_by_email(user_data.email)
-            if existing_email:
+            if existing:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Email already registered"
                 )
             
             # Create new user
-            hashed_password = get_password_hash(user_data.password)
+            hashed_password = await self.get_password_hash(user_data.password)
             user = User(
                 username=user_data.username,
                 email=user_data.email,
@@ -90,6 +240,20 @@ class AuthService:
             logger.error(f"Database error getting user by email: {e}")
             raise DatabaseError(f"Failed to get user: {str(e)}")
     
+    async def get_user_by_login(self, login: str) -> Optional[User]:
+        """Get user by username or email, preferring a username match."""
+        try:
+            result = await self.session.execute(
+                select(User).where(or_(User.username == login, User.email == login)).limit(2)
+            )
+            users = result.scalars().all()
+            # One user's username may equal another's email; username wins
+            return next((user for user in users if user.username == login), users[0] if users else None)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error getting user by login: {e}")
+            raise DatabaseError(f"Failed to get user: {str(e)}")
+    
+    @cached_user
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID."""
         try:
@@ -101,26 +265,41 @@ class AuthService:
             logger.error(f"Database error getting user by ID: {e}")
             raise DatabaseError(f"Failed to get user: {str(e)}")
     
+    async def get_hashed_password(self, user_id: int) -> Optional[str]:
+        """Read a user's password hash, which the user cache does not hold."""
+        try:
+            result = await self.session.execute(
+                select(User.hashed_password).where(User.id == user_id)
+            )
+            return result.scalar_one_or_none()
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Database error getting password hash: {e}")
+            raise DatabaseError(f"Failed to get password hash: {str(e)}")
+    
     async def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """Authenticate a user with username/email and password."""
         try:
-            # Try username first, then email
-            user = await self.get_user_by_username(username)
-            if not user:
-                user = await self.get_user_by_email(username)
-            
+            user = await self.get_user_by_login(username)
             if not user:
                 return None
             
-            if not verify_password(password, user.hashed_password):
+            verified, new_hash = await asyncio.to_thread(
+                verify_and_update_password, password, user.hashed_password
+            )
+            if not verified:
                 return None
             
             if not user.is_active:
                 return None
             
-            # Update last login
-            user.last_login = datetime.utcnow()
-            await self.session.commit()
+            if new_hash:
+                # Legacy bcrypt (or outdated cost) hash; upgrade it in place
+                user.hashed_password = new_hash
+                await self.session.commit()
+            
+            # Written in the next batch rather than committed on the login path
+            record_last_login(user.id)
             
             return user
             
@@ -160,6 +339,9 @@ class AuthService:
                 "sub": str(user.id),
                 "username": user.username
             }
+            revocation_state = await self._issue_revocation_state(user.id)
+            if revocation_state is not None:
+                refresh_token_data["rgen"], refresh_token_data["rver"] = revocation_state
             refresh_token = create_refresh_token(refresh_token_data)
             
             # Store refresh token in database
@@ -181,7 +363,7 @@ class AuthService:
         """Store refresh token in database."""
         try:
             token_hash = generate_token_hash(refresh_token)
-            expires_at = datetime.utcnow() + timedelta(days=30)  # 30 days
+            expires_at = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
             
             refresh_token_record = RefreshToken(
                 user_id=user_id,
@@ -204,19 +386,11 @@ class AuthService:
             payload = verify_token(refresh_token, "refresh")
             user_id = int(payload.get("sub"))
             
-            # Check if token exists in database
-            token_hash = generate_token_hash(refresh_token)
-            result = await self.session.execute(
-                select(RefreshToken).where(
-                    RefreshToken.token_hash == token_hash,
-                    RefreshToken.user_id == user_id,
-                    RefreshToken.is_revoked == False,
-                    RefreshToken.expires_at > datetime.utcnow()
-                )
-            )
-            token_record = result.scalar_one_or_none()
-            
-            if not token_record:
+            revoked = await self._is_revoked_in_redis(user_id, payload)
+            if revoked is None:
+                # No usable Redis state for this token: check the table
+                return await self._get_user_for_stored_token(refresh_token, user_id)
+            if revoked:
                 return None
             
             # Get user
@@ -230,8 +404,68 @@ class AuthService:
             logger.error(f"Error verifying refresh token: {e}")
             return None
     
+    async def _issue_revocation_state(self, user_id: int) -> Optional[Tuple[str, int]]:
+        """Return the (gen, ver) to embed in a new refresh token, creating the hash if needed."""
+        if not redis_available():
+            return None
+        key = _revocation_key(user_id)
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.hsetnx(key, "gen", uuid.uuid4().hex)
+            pipe.hsetnx(key, "ver", 0)
+            pipe.hmget(key, "gen", "ver")
+            pipe.expire(key, _REVOCATION_TTL)
+            _, _, (gen, ver), _ = await pipe.execute()
+        except RedisError as e:
+            # The token is still valid; it is just always checked in the table
+            logger.warning(f"Revocation state unavailable, token will use database checks: {e}")
+            mark_redis_down()
+            return None
+        return gen.decode(), int(ver)
+    
+    async def _is_revoked_in_redis(self, user_id: int, payload: Dict[str, Any]) -> Optional[bool]:
+        """Check a verified refresh token against Redis; None if Redis can't tell."""
+        jti, gen = payload.get("jti"), payload.get("rgen")
+        if jti is None or gen is None or not redis_available():
+            return None
+        try:
+            current_gen, current_ver, revoked = await redis_client.hmget(
+                _revocation_key(user_id), "gen", "ver", f"jti:{jti}"
+            )
+        except RedisError as e:
+            logger.warning(f"Revocation lookup failed, checking database: {e}")
+            mark_redis_down()
+            return None
+        if current_gen is None or current_gen.decode() != gen:
+            # State lost or recreated since the token was issued
+            return None
+        return revoked is not None or payload.get("rver", 0) < int(current_ver)
+    
+    async def _get_user_for_stored_token(self, refresh_token: str, user_id: int) -> Optional[User]:
+        """Load the active user owning a live, unrevoked stored refresh token in one query."""
+        token_hash = generate_token_hash(refresh_token)
+        result = await self.session.execute(
+            select(User)
+            .join(RefreshToken, RefreshToken.user_id == User.id)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.user_id == user_id,
+                RefreshToken.is_revoked == False,
+                RefreshToken.expires_at > datetime.utcnow(),
+                User.is_active == True
+            )
+        )
+        return result.scalar_one_or_none()
+    
     async def revoke_refresh_token(self, refresh_token: str) -> None:
         """Revoke a refresh token."""
+        try:
+            payload = verify_token(refresh_token, "refresh")
+        except HTTPException:
+            # Expired or invalid tokens are already unusable
+            payload = None
+        
+        # The table stays the audit trail and the fallback when Redis can't tell
         try:
             token_hash = generate_token_hash(refresh_token)
             await self.session.execute(
@@ -239,25 +473,60 @@ class AuthService:
                 .where(RefreshToken.token_hash == token_hash)
                 .values(is_revoked=True, revoked_at=datetime.utcnow())
             )
+            
+            # Deny it in Redis before committing, so a Redis failure aborts the
+            # revocation instead of leaving it recorded only in the table
+            if payload and payload.get("jti") is not None:
+                key = _revocation_key(int(payload["sub"]))
+                pipe = redis_client.pipeline(transaction=True)
+                pipe.hset(key, f"jti:{payload['jti']}", 1)
+                pipe.expire(key, _REVOCATION_TTL)
+                await pipe.execute()
+            
             await self.session.commit()
             
         except SQLAlchemyError as e:
+            await self.session.rollback()
             logger.error(f"Database error revoking refresh token: {e}")
             raise DatabaseError(f"Failed to revoke refresh token: {str(e)}")
+        except RedisError as e:
+            await self.session.rollback()
+            logger.error(f"Redis error revoking refresh token: {e}")
+            raise InternalServerException("Failed to revoke refresh token")
     
-    async def revoke_all_user_tokens(self, user_id: int) -> None:
-        """Revoke all refresh tokens for a user."""
+    async def revoke_all_user_tokens(self, user_id: int, flush_only: bool = False) -> None:
+        """
+        Revoke all refresh tokens for a user.
+        
+        With flush_only the UPDATE is left uncommitted so the caller can commit
+        it together with its own writes; on failure the session is rolled back.
+        """
         try:
             await self.session.execute(
                 update(RefreshToken)
                 .where(RefreshToken.user_id == user_id)
                 .values(is_revoked=True, revoked_at=datetime.utcnow())
             )
-            await self.session.commit()
+            
+            # Token ids aren't stored, so bump the version every live token
+            # was issued under; written before the commit, as above
+            key = _revocation_key(user_id)
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.hincrby(key, "ver", 1)
+            pipe.expire(key, _REVOCATION_TTL)
+            await pipe.execute()
+            
+            if not flush_only:
+                await self.session.commit()
             
         except SQLAlchemyError as e:
+            await self.session.rollback()
             logger.error(f"Database error revoking user tokens: {e}")
             raise DatabaseError(f"Failed to revoke user tokens: {str(e)}")
+        except RedisError as e:
+            await self.session.rollback()
+            logger.error(f"Redis error revoking user tokens: {e}")
+            raise InternalServerException("Failed to revoke user tokens")
     
     async def cleanup_expired_tokens(self) -> None:
         """Clean up expired refresh tokens."""
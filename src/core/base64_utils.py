@@ -1,21 +1,71 @@
-import base64
 import numpy as np
 import cv2
 
+try:
+    # SIMD-accelerated codec; same API as the stdlib module
+    import pybase64 as _base64
+except ImportError:
+    import base64 as _base64
+
+
+def b64decode(data):
+    """Decode base64 data to bytes."""
+    return _base64.b64decode(data)
+
+def b64encode(data):
+    """Encode bytes to base64 bytes."""
+    return _base64.b64encode(data)
+
+def decode_to_nparr(data):
+    """Decode a payload to a uint8 buffer ready for cv2.imdecode.
+    
+    Strings are base64-decoded; bytes input is taken as already decoded.
+    """
+    if isinstance(data, str):
+        data = b64decode(data)
+    return np.frombuffer(data, np.uint8)
+
 def decode_image(base64_string):
-    """Decode a base64 image to numpy array."""
-    img_data = base64.b64decode(base64_string)
-    nparr = np.frombuffer(img_data, np.uint8)
+    """Decode a base64 image (or its raw bytes) to numpy array."""
+    nparr = decode_to_nparr(base64_string)
     img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
     return img
 
 def decode_segmentation_map(base64_string):
-    """Decode a base64 segmentation map to numpy array."""
-    img_data = base64.b64decode(base64_string)
-    nparr = np.frombuffer(img_data, np.uint8)
+    """Decode a base64 segmentation map (or its raw bytes) to numpy array."""
+    nparr = decode_to_nparr(base64_string)
     # Try to decode as color first, then fallback to grayscale
     segmap = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
     if segmap is None:
         # Fallback to grayscale
         segmap = cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
-    return segmap
\ No newline at end of file
+    return segmap
+
+# Reduced-scale grayscale decode modes by downscale factor
+_REDUCED_GRAYSCALE = {
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    1: cv2.IMREAD_GRAYSCALE,
+}
+
+def decode_image_for_phash(data, min_size=32):
+    """Decode a grayscale image at the coarsest codec scale that keeps min_size.
+    
+    JPEG decoders downscale in the DCT domain, skipping most of the inverse
+    transform. Returns None if the payload is not a decodable image.
+    """
+    nparr = decode_to_nparr(data)
+    try:
+        img = cv2.imdecode(nparr, _REDUCED_GRAYSCALE[8])
+    except cv2.error:
+        # Some codecs (e.g. PNG) reject a reduction larger than the image
+        return cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
+    if img is None or min(img.shape[:2]) >= min_size:
+        return img
+    
+    # Too small at 1/8; estimate the full size and pick the coarsest scale
+    # that still fits, so at most one more decode is needed
+    full_size = min(img.shape[:2]) * 8
+    factor = next(f for f in (4, 2, 1) if full_size // f >= min_size or f == 1)
+    return cv2.imdecode(nparr, _REDUCED_GRAYSCALE[factor])
@@ -2,6 +2,7 @@
 Global application configuration.
 """
 
+import functools
 import os
 from typing import Optional
 from pydantic import Field, field_validator
@@ -25,6 +26,13 @@ class DatabaseConfig(BaseSettings):
     username: str = "postgres"
     password: str = "postgres"
     database: str = "facial_api"
+    # Connection pool; the default size follows the (cores * 2) + spindles rule
+    pool_size: int = Field(default_factory=lambda: (os.cpu_count() or 1) * 2 + 1)
+    max_overflow: int = 20
+    pool_timeout: int = 30
+    pool_recycle: int = 3600
+    # asyncpg prepared statement cache; set to 0 behind pgbouncer in transaction mode
+    statement_cache_size: int = 100
     
     model_config = SettingsConfigDict(
         env_prefix="DB_",
@@ -64,6 +72,11 @@ class AuthConfig(BaseSettings):
     access_token_expire_minutes: int = Field(30, description="Access token expiration in minutes")
     refresh_token_expire_days: int = Field(7, description="Refresh token expiration in days")
     algorithm: str = Field("HS256", description="JWT algorithm")
+    password_hash_time_cost: int = Field(2, description="Argon2id iterations per password hash")
+    password_hash_memory_kib: int = Field(64 * 1024, description="Argon2id memory per password hash in KiB")
+    password_hash_parallelism: int = Field(2, description="Argon2id lanes per password hash")
+    rate_limit_capacity: int = Field(5, description="Login/refresh burst size per client")
+    rate_limit_refill_per_sec: float = Field(5 / 60, description="Login/refresh sustained rate per client")
     
     model_config = SettingsConfigDict(
         env_prefix="AUTH_",
@@ -77,6 +90,8 @@ class RateLimitConfig(BaseSettings):
     requests_per_hour: int = Field(100, description="Requests per hour per IP/user")
     window_seconds: int = Field(3600, description="Rate limit window in seconds")
     burst_limit: int = Field(10, description="Burst limit for short periods")
+    redis_url: str = Field("redis://localhost:6379", validation_alias="REDIS_URL",
+                           description="Redis connection string for shared limiter state")
     
     model_config = SettingsConfigDict(
         env_prefix="RATE_LIMIT_",
@@ -139,5 +154,14 @@ def load_config() -> Config:
     return config
 
 
-# Create a global config instance
-config = load_config()
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Return the process-wide configuration, loading it on first use."""
+    return load_config()
+
+
+def __getattr__(name: str):
+    """Resolve the legacy module-level `config` lazily (PEP 562)."""
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
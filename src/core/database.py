@@ -3,13 +3,19 @@ Database session management and configuration for SQLAlchemy.
 """
 
 from typing import AsyncGenerator, Annotated
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from fastapi import Depends
-from src.core.config import config
+from src.core.config import get_config
 from src.core.exceptions import InternalServerException
 from src.core.utils import logger
 
 
+def _json_dumps(value) -> str:
+    """Serialize JSON columns with orjson (int mask keys, numpy values)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
 class DatabaseManager:
     """Manages database connections and sessions using SQLAlchemy."""
     
@@ -18,14 +24,16 @@ class DatabaseManager:
         Initialize database manager.
         
         Args:
-            database_url: Database connection URL (defaults to config value)
+            database_url: Database connection URL (defaults to config value,
+                resolved in initialize())
         """
-        self.database_url = database_url or self._get_database_url()
+        self.database_url = database_url
         self.engine = None
         self.session_factory = None
     
     def _get_database_url(self) -> str:
         """Get database URL from configuration."""
+        config = get_config()
         if not config.db.use_database:
             return "sqlite:///./facial_api.db"  # Default to SQLite when disabled
         
@@ -40,12 +48,33 @@ class DatabaseManager:
     
     async def initialize(self) -> None:
         """Initialize database engine and session factory."""
+        config = get_config()
+        if self.database_url is None:
+            self.database_url = self._get_database_url()
+        
         try:
+            engine_options = {}
+            if self.database_url.startswith("postgresql+asyncpg://"):
+                # SQLite uses its own pool classes, which don't take these
+                engine_options = {
+                    "pool_size": config.db.pool_size,
+                    "max_overflow": config.db.max_overflow,
+                    "pool_timeout": config.db.pool_timeout,
+                    "connect_args": {
+                        # Short OLTP queries never benefit from JIT compilation
+                        "server_settings": {"jit": "off"},
+                        "statement_cache_size": config.db.statement_cache_size,
+                    },
+                }
+            
             self.engine = create_async_engine(
                 self.database_url,
                 echo=config.debug,  # Log SQL queries in debug mode
                 pool_pre_ping=True,  # Verify connections before use
-                pool_recycle=3600,   # Recycle connections every hour
+                pool_recycle=config.db.pool_recycle,
+                json_serializer=_json_dumps,
+                json_deserializer=orjson.loads,
+                **engine_options,
             )
             
             self.session_factory = async_sessionmaker(
@@ -2,10 +2,26 @@
 Image processing module for facial contour extraction and output generation.
 """
 
-import base64
-import xml.etree.ElementTree as ET
+import io
 from abc import ABC, abstractmethod
+from itertools import chain
+from operator import itemgetter
 from typing import List, Dict,Tuple
+from xml.sax.saxutils import escape
+from src.core.base64_utils import b64encode
+
+# Extra entities needed to escape a value inside a quoted attribute; single
+# quotes too, since the data URI form swaps the quote character
+_ATTR_ENTITIES = {'"': "&quot;", "'": "&#39;"}
+
+# Pulls the (x, y) pair out of a contour point dict
+_POINT_XY = itemgetter("x", "y")
+
+# Minimal escaping for an SVG data URI: only what breaks URL or attribute
+# parsing, with double quotes swapped for single so none need escaping
+_DATA_URI_ESCAPES = str.maketrans({
+    "%": "%25", "#": "%23", "<": "%3C", ">": "%3E", "&": "%26", '"': "'"
+})
 
 
 class OutputGenerator(ABC):
@@ -20,7 +36,10 @@ class OutputGenerator(ABC):
 class SVGGenerator(OutputGenerator):
     """SVG output generator for contours."""
     
-    def __init__(self):
+    def __init__(self, data_uri: bool = False):
+        # Return a URL-encoded data: URI instead of base64 when the consumer
+        # embeds the SVG directly; it is smaller and skips an encode pass
+        self.data_uri = data_uri
         self.region_styles = {
             "1": {"stroke": "#FF0000", "fill": "rgba(255,0,0,0.2)"},
             "2": {"stroke": "#00FF00", "fill": "rgba(0,255,0,0.2)"},
@@ -30,60 +49,77 @@ class SVGGenerator(OutputGenerator):
             "6": {"stroke": "#00FFFF", "fill": "rgba(0,255,255,0.2)"},
             "7": {"stroke": "#FFFFFF", "fill": "rgba(255,255,255,0.2)"}
         }
+        self.default_style = {"stroke": "#000000", "fill": "rgba(0,0,0,0.2)"}
+        # Path attributes after "d" are fixed per region; build them once
+        self._region_attributes = {
+            region_id: self._path_attributes(region_id, style)
+            for region_id, style in self.region_styles.items()
+        }
     
     def generate(self, image_shape: Tuple[int, int], regions: Dict[str, List]) -> str:
         """Generate SVG with regions drawn as contours."""
-        svg_root = self._create_svg_root(image_shape)
-        self._add_regions_to_svg(svg_root, regions)
-        return self._encode_svg(svg_root)
+        # Every attribute value is numeric or a fixed style constant, so the
+        # markup is written directly instead of building an ElementTree
+        buffer = io.StringIO()
+        self._write_svg_open(buffer, image_shape)
+        self._add_regions_to_svg(buffer, regions)
+        buffer.write("</svg>")
+        return self._encode_svg(buffer.getvalue())
     
-    def _create_svg_root(self, image_shape: Tuple[int, int]) -> ET.Element:
-        """Create the root SVG element."""
-        return ET.Element("svg", {
-            "width": str(image_shape[1]),
-            "height": str(image_shape[0]),
-            "xmlns": "http://www.w3.org/2000/svg",
-            "viewBox": f"0 0 {image_shape[1]} {image_shape[0]}"
-        })
+    def _write_svg_open(self, buffer: io.StringIO, image_shape: Tuple[int, int]) -> None:
+        """Write the opening root SVG tag."""
+        height, width = image_shape
+        buffer.write(
+            f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg" '
+            f'viewBox="0 0 {width} {height}">'
+        )
     
-    def _add_regions_to_svg(self, svg_root: ET.Element, regions: Dict[str, List]) -> None:
-        """Add regions as paths to the SVG."""
+    def _add_regions_to_svg(self, buffer: io.StringIO, regions: Dict[str, List]) -> None:
+        """Add each region as a single path, one subpath per contour."""
         for region_id, contours in regions.items():
-            for contour in contours:
-                if not contour:  # Skip empty contours
-                    continue
-                    
-                path_data = self._create_path_data(contour)
-                self._create_path_element(svg_root, path_data, region_id)
+            if not contours:  # Region absent from this image
+                continue
+            
+            # Each contour is a closed M...Z subpath, so they share one element
+            path_data = " ".join([self._create_path_data(contour) for contour in contours if contour])
+            if path_data:
+                self._create_path_element(buffer, path_data, region_id)
     
     def _create_path_data(self, contour: List[Dict[str, float]]) -> str:
         """Create SVG path data from contour points."""
         if not contour:
             return ""
         
-        path_data = f"M{contour[0]['x']},{contour[0]['y']}"
-        for point in contour[1:]:
-            path_data += f" L{point['x']},{point['y']}"
-        path_data += " Z"  # Close the path
-        return path_data
+        # Move to the first point, line to the rest, close the path. The whole
+        # path is one %-template filled in a single C-level pass; %g keeps six
+        # significant digits (sub-pixel) instead of a float's full repr
+        template = "M%g,%g" + " L%g,%g" * (len(contour) - 1) + " Z"
+        return template % tuple(chain.from_iterable(map(_POINT_XY, contour)))
+    
+    def _path_attributes(self, region_id: str, style: Dict[str, str]) -> str:
+        """Render the style and class attributes shared by a region's paths."""
+        return (
+            f'stroke="{style["stroke"]}" stroke-width="2" stroke-dasharray="5,5" '
+            f'fill="{style["fill"]}" class="region-{escape(str(region_id), _ATTR_ENTITIES)}"'
+        )
     
-    def _create_path_element(self, svg_root: ET.Element, path_data: str, region_id: str) -> None:
-        """Create and add a path element to the SVG."""
-        style = self.region_styles.get(region_id, {"stroke": "#000000", "fill": "rgba(0,0,0,0.2)"})
+    def _create_path_element(self, buffer: io.StringIO, path_data: str, region_id: str) -> None:
+        """Write a path element for a region."""
+        attributes = self._region_attributes.get(region_id)
+        if attributes is None:
+            attributes = self._path_attributes(region_id, self.default_style)
         
-        ET.SubElement(svg_root, "path", {
-            "d": path_data,
-            "stroke": style["stroke"],
-            "stroke-width": "2",
-            "stroke-dasharray": "5,5",
-            "fill": style["fill"],
-            "class": f"region-{region_id}"
-        })
+        buffer.write(f'<path d="{path_data}" {attributes} />')
     
-    def _encode_svg(self, svg_root: ET.Element) -> str:
-        """Convert SVG to base64 encoded string."""
-        svg_string = ET.tostring(svg_root, encoding="utf-8").decode("utf-8")
-        return base64.b64encode(svg_string.encode("utf-8")).decode("utf-8")
+    def _encode_svg(self, svg_string: str) -> str:
+        """Convert SVG markup to a base64 string, or a data URI if configured."""
+        if self.data_uri:
+            return "data:image/svg+xml," + svg_string.translate(_DATA_URI_ESCAPES)
+        return b64encode(svg_string.encode("utf-8")).decode("utf-8")
+
+
+# generate() never mutates the instance, so processors can share one
+_SHARED_SVG_GENERATOR = SVGGenerator()
 
 
 class FileProcessor:
@@ -94,7 +130,11 @@ class FileProcessor:
     
     def create(self, image_shape: Tuple[int, int], regions: Dict[str, List]) -> str:
         """Create output using the configured generator."""
-        if not self._validate_inputs(image_shape, regions):
+        try:
+            height, width = image_shape
+        except (TypeError, ValueError):
+            raise ValueError("Invalid input parameters") from None
+        if height <= 0 or width <= 0 or not isinstance(regions, dict):
             raise ValueError("Invalid input parameters")
         
         return self.generator.generate(image_shape, regions)
@@ -102,16 +142,6 @@ class FileProcessor:
     def set_generator(self, generator: OutputGenerator) -> None:
         """Change the output generator."""
         self.generator = generator
-    
-    def _validate_inputs(self, image_shape: Tuple[int, int], regions: Dict[str, List]) -> bool:
-        """Validate input parameters."""
-        if not image_shape or len(image_shape) != 2:
-            return False
-        if image_shape[0] <= 0 or image_shape[1] <= 0:
-            return False
-        if not isinstance(regions, dict):
-            return False
-        return True
 
 
 # Factory for easy instantiation
@@ -120,18 +150,20 @@ class GeneratorFactory:
     
     @staticmethod
     def create_svg_generator() -> SVGGenerator:
-        """Create an SVG generator."""
-        return SVGGenerator()
+        """Return the shared default SVG generator."""
+        return _SHARED_SVG_GENERATOR
     
     @staticmethod
     def create_processor(generator_type: str = 'svg') -> FileProcessor:
         """Create a processor with the specified generator type."""
-        generators = {
-            'svg': GeneratorFactory.create_svg_generator(),
-        }
-        
-        generator = generators.get(generator_type.lower())
-        if not generator:
+        create_generator = _GENERATORS.get(generator_type.lower())
+        if create_generator is None:
             raise ValueError(f"Unknown generator type: {generator_type}")
         
-        return FileProcessor(generator)
+        return FileProcessor(create_generator())
+
+
+# Generator constructors by type name; only the requested one is built
+_GENERATORS = {
+    'svg': GeneratorFactory.create_svg_generator,
+}
@@ -0,0 +1,32 @@
+"""
+Shared Redis client.
+"""
+
+import time
+import redis.asyncio as redis
+from src.core.config import config
+
+# Connections are opened lazily from the client's pool on first command.
+# Short connect and read timeouts let callers fall back quickly if Redis is
+# down or stops answering
+redis_client = redis.from_url(
+    config.rate_limit.redis_url,
+    socket_connect_timeout=0.5,
+    socket_timeout=0.5,
+)
+
+# After a failure, optional Redis users (caches, rate limiting) skip Redis
+# for this many seconds rather than paying the timeout on every request
+REDIS_RETRY_INTERVAL = 5.0
+_redis_retry_at = 0.0
+
+
+def redis_available() -> bool:
+    """Whether optional Redis calls should be attempted right now."""
+    return time.monotonic() >= _redis_retry_at
+
+
+def mark_redis_down() -> None:
+    """Back off from Redis for REDIS_RETRY_INTERVAL seconds after a failure."""
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
@@ -4,33 +4,72 @@ Core utility functions and logging setup.
 
 from rich.console import Console
 from rich.logging import RichHandler
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
-from rich.traceback import install
+from logging.handlers import QueueHandler, QueueListener
 import logging
+import os
+import queue
 import sys
 import time
 
-# Install rich traceback handler
-install()
+# Rich's global traceback hook is opt-in; it is slow to import and only
+# useful when a developer is watching the console
+if os.getenv("RICH_TRACEBACKS"):
+    from rich.traceback import install
+    install()
 
 # Create rich console
 console = Console()
 
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread."""
+    
+    def prepare(self, record):
+        # Records never leave the process, so skip the eager format/pickle step
+        return record
+
+
+# Rich formatting and console IO run on a background listener thread
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(
+    log_queue,
+    RichHandler(rich_tracebacks=True, console=console),
+    respect_handler_level=True
+)
+
 # Configure logging with Rich
 logging.basicConfig(
     level=logging.INFO,
     format="%(message)s",
     datefmt="[%X]",
-    handlers=[RichHandler(rich_tracebacks=True, console=console)]
+    handlers=[NonBlockingQueueHandler(log_queue)]
 )
+log_listener.start()
 
 logger = logging.getLogger("facial_api")
 
+# Console colour for each job status; anything else renders white
+_STATUS_STYLE = {
+    "queued": "yellow",
+    "pending": "yellow",
+    "processing": "blue",
+    "completed": "green",
+    "failed": "red"
+}
+
+# Job status messages with the colour markup baked in; the job ID and error
+# suffix are filled in lazily by the logger
+_JOB_STATUS_TEMPLATES = {
+    status: f"Job [bold]%s[/bold]: [bold {color}]{status}[/bold {color}]%s"
+    for status, color in _STATUS_STYLE.items()
+}
+_JOB_STATUS_FALLBACK = "Job [bold]%s[/bold]: [bold white]%s[/bold white]%s"
+
 
 def log_startup_banner(app_name: str, version: str):
     """Display a startup banner in the console."""
+    from rich.panel import Panel
+    
     console.print(Panel.fit(f"[bold blue]{app_name}[/bold blue] [green]v{version}[/green]", 
                            subtitle="Facial Contour Masking API", 
                            border_style="green"))
@@ -38,41 +77,44 @@ def log_startup_banner(app_name: str, version: str):
 
 def log_request(request, data=None):
     """Log an incoming API request."""
-    client_ip = request.client.host if request.client else "unknown"
-    method = request.method
-    endpoint = request.url.path
-    logger.info(f"Request: [bold]{method.upper()}[/bold] {endpoint} from [italic]{client_ip}[/italic]")
-    if data:
+    if logger.isEnabledFor(logging.INFO):
+        client_ip = request.client.host if request.client else "unknown"
+        # %-style args are only formatted if a handler actually emits the record
+        logger.info("Request: [bold]%s[/bold] %s from [italic]%s[/italic]",
+                    request.method.upper(), request.url.path, client_ip)
+    if data and logger.isEnabledFor(logging.DEBUG):
         # Log only essential data, not the entire request body
         log_data = {}
         if hasattr(data, "job_id") and data.job_id:
             log_data["job_id"] = data.job_id
         if hasattr(data, "options") and data.options:
             log_data["options"] = data.options
-        logger.debug(f"Request data: {log_data}")
+        if getattr(data, "image", None):
+            log_data["image_len"] = len(data.image)
+        if getattr(data, "landmarks", None):
+            log_data["landmarks"] = len(data.landmarks)
+        logger.debug("Request data: %s", log_data)
 
 
 def log_response(request, response_data):
     """Log an API response."""
-    method = request.method
-    endpoint = request.url.path
-    status_code = 200  # Default for successful response
-    color = "green" if status_code < 400 else "red"
-    logger.info(f"Response: [bold]{method.upper()}[/bold] {endpoint} → [bold {color}]{status_code}[/bold {color}]")
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    # Responses logged here are successful; the status markup is fixed
+    logger.info("Response: [bold]%s[/bold] %s → [bold green]200[/bold green]",
+                request.method.upper(), request.url.path)
 
 
 def log_job_status(job_id: str, status: str, progress: float = 0.0, error: str = None):
     """Log a job status update."""
-    color_map = {
-        "queued": "yellow",
-        "pending": "yellow",
-        "processing": "blue",
-        "completed": "green",
-        "failed": "red"
-    }
-    color = color_map.get(status, "white")
+    if not logger.isEnabledFor(logging.INFO):
+        return
     error_str = f" - Error: {error}" if error else ""
-    logger.info(f"Job [bold]{job_id}[/bold]: [bold {color}]{status}[/bold {color}]{error_str}")
+    template = _JOB_STATUS_TEMPLATES.get(status)
+    if template is None:
+        logger.info(_JOB_STATUS_FALLBACK, job_id, status, error_str)
+    else:
+        logger.info(template, job_id, error_str)
 
 
 def log_processing_step(step_name: str, success: bool = True):
@@ -88,8 +130,17 @@ def log_error(error_message: str, exception=None):
         logger.exception(exception)
 
 
+def _format_timestamp(value) -> str:
+    """Render a datetime as YYYY-MM-DD HH:MM:SS without its UTC offset."""
+    # isoformat is C-level, unlike strftime's format parsing; the slice drops
+    # the offset that timezone-aware columns would otherwise append
+    return value.isoformat(sep=" ", timespec="seconds")[:19]
+
+
 def log_job_table(jobs):
     """Display a table of jobs."""
+    from rich.table import Table
+    
     table = Table(title="Job Status")
     table.add_column("Job ID", style="cyan")
     table.add_column("Status", style="green")
@@ -97,18 +148,12 @@ def log_job_table(jobs):
     table.add_column("Updated At", style="yellow")
     
     for job_id, job in jobs.items():
-        status_style = {
-            "pending": "yellow",
-            "processing": "blue",
-            "completed": "green",
-            "failed": "red"
-        }.get(job.status, "white")
-        
+        style = _STATUS_STYLE.get(job.status, "white")
         table.add_row(
             job_id,
-            f"[{status_style}]{job.status}[/{status_style}]",
-            job.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            job.updated_at.strftime("%Y-%m-%d %H:%M:%S")
+            f"[{style}]{job.status}[/{style}]",
+            _format_timestamp(job.created_at),
+            _format_timestamp(job.updated_at)
         )
     
     console.print(table)
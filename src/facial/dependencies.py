@@ -2,26 +2,39 @@
 Dependencies for facial processing endpoints.
 """
 
-from typing import Optional
-from fastapi import Depends, HTTPException, status
-from src.core.database import SessionDep
+from typing import AsyncGenerator, Optional
+from fastapi import Depends, HTTPException, Request, status
+from src.core.database import db_manager
+from src.core.exceptions import InternalServerException
 from src.facial.service import DatabaseService, get_database_service
 from src.facial.perceptual_caching import PerceptualHashCache
-from src.core.config import config
+from src.core.config import get_config
 
 
-async def get_db_service(session: SessionDep) -> Optional[DatabaseService]:
-    """Get database service with session dependency."""
-    # Return None if database is disabled
-    if not config.db.use_database:
-        return None
-    return get_database_service(session)
+async def get_db_service() -> AsyncGenerator[Optional[DatabaseService], None]:
+    """Get database service, or None when the database is disabled."""
+    if not get_config().db.use_database:
+        yield None
+        return
+    if not db_manager.session_factory:
+        raise InternalServerException("Database not initialized")
+    
+    async with db_manager.session_factory() as session:
+        try:
+            yield get_database_service(session)
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
 
 
-async def get_perceptual_hash_cache(
-    db_service: Optional[DatabaseService] = Depends(get_db_service)
-) -> Optional[PerceptualHashCache]:
-    """Get perceptual hash cache with database service dependency."""
-    if db_service is None:
+def get_perceptual_hash_cache(request: Request) -> Optional[PerceptualHashCache]:
+    """Get the process-wide perceptual hash cache created at startup.
+    
+    Returns None when the database is disabled; callers should skip
+    perceptual hashing entirely in that case.
+    """
+    if not get_config().db.use_database:
         return None
-    return PerceptualHashCache(db_service)
+    return getattr(request.app.state, "perceptual_hash_cache", None)
@@ -1,3 +1,4 @@
+import math
 import cv2
 import numpy as np
 
@@ -22,7 +23,11 @@ def get_padded_bbox(points, img_shape):
     Returns:
         Tuple[int, int, int, int]: x_start, y_start, x_end, y_end of the cropped region.
     """
-    x, y, w, h = cv2.boundingRect(points.astype(np.int32))
+    # Same box as cv2.boundingRect(points.astype(np.int32)): truncation is
+    # monotonic, so truncate the extrema instead of copying every point
+    x, y = (int(v) for v in points.min(axis=0))
+    x_max, y_max = (int(v) for v in points.max(axis=0))
+    w, h = x_max - x + 1, y_max - y + 1
     padding_x, padding_y_top, padding_y_bottom = calculate_asymmetric_padding(w, h)
     
     x_start = max(x - padding_x, 0)
@@ -32,13 +37,34 @@ def get_padded_bbox(points, img_shape):
     
     return x_start, y_start, x_end, y_end
 
+def warp_crop(image, M, crop_box, flags=cv2.INTER_LINEAR, borderValue=0):
+    """
+    Applies an affine warp and returns only the given window of the warped output.
+    
+    Args:
+        image (ndarray): Source image.
+        M (ndarray): 2x3 affine matrix mapping source to the full warped frame.
+        crop_box (tuple): x_start, y_start, x_end, y_end in the warped frame.
+    
+    Returns:
+        ndarray: warpAffine(image, M, full size)[y_start:y_end, x_start:x_end], up to
+        OpenCV's fixed-point interpolation rounding.
+    """
+    x_start, y_start, x_end, y_end = crop_box
+    shifted = M.copy()
+    shifted[:, 2] -= (x_start, y_start)
+    return cv2.warpAffine(
+        image, shifted, (x_end - x_start, y_end - y_start), flags=flags,
+        borderMode=cv2.BORDER_CONSTANT, borderValue=borderValue
+    )
+
 def rotate_and_crop_face(image, landmarks, angle=None, return_crop_box=False):
     """
     Rotates the face based on eye alignment and crops it with padding.
     
     Args:
         image (ndarray): Original facial image (RGB or BGR).
-        landmarks (ndarray): Facial landmarks as a (N, 2) array.
+        landmarks (ndarray): Facial landmarks as a contiguous (N, 2) float32 array.
     
     Returns:
         cropped_image (ndarray): Cropped and aligned face image.
@@ -53,30 +79,31 @@ def rotate_and_crop_face(image, landmarks, angle=None, return_crop_box=False):
     left_eye_center = left_eye_pts.mean(axis=0)
     right_eye_center = right_eye_pts.mean(axis=0)
 
-    # Compute angle between eyes
-    dY = right_eye_center[1] - left_eye_center[1]
-    dX = right_eye_center[0] - left_eye_center[0]
-    angle = np.degrees(np.arctan2(dY, dX))
+    # Direction between eyes
+    dY = float(right_eye_center[1] - left_eye_center[1])
+    dX = float(right_eye_center[0] - left_eye_center[0])
 
-    # Get rotation matrix around image center
-    center = (w // 2, h // 2)
-    M = cv2.getRotationMatrix2D(center, angle, 1.0)
-
-    # Rotate the image and landmarks
-    rotated_image = cv2.warpAffine(
-        image, M, (w, h), flags=cv2.INTER_CUBIC,
-        borderMode=cv2.BORDER_CONSTANT, borderValue=(224, 224, 224)
-    )
-    rotated_landmarks = cv2.transform(landmarks.reshape(-1, 1, 2), M).reshape(-1, 2)
+    # Rotation matrix around image center, as cv2.getRotationMatrix2D would
+    # build for angle atan2(dY, dX), taking cos/sin straight from the eye vector
+    eye_distance = math.hypot(dX, dY)
+    cos_a, sin_a = (dX / eye_distance, dY / eye_distance) if eye_distance else (1.0, 0.0)
+    cx, cy = w // 2, h // 2
+    M = np.array([
+        [cos_a, sin_a, (1 - cos_a) * cx - sin_a * cy],
+        [-sin_a, cos_a, sin_a * cx + (1 - cos_a) * cy]
+    ])
 
-    # Crop a padded region around the rotated landmarks
-    x1, y1, x2, y2 = get_padded_bbox(rotated_landmarks, rotated_image.shape)
-    cropped_image = rotated_image[y1:y2, x1:x2]
-    cropped_landmarks = rotated_landmarks - np.array([x1, y1])  # Shift landmarks to cropped coordinates
+    # Rotate the landmarks (a plain matmul; cheaper than cv2.transform for a
+    # few hundred points) and find the padded crop in the rotated frame.
+    # Landmarks arrive as float32; cast the 2x3 matrix, never the points
+    M32 = M.astype(np.float32)
+    rotated_landmarks = landmarks @ M32[:, :2].T + M32[:, 2]
+    x_start, y_start, x_end, y_end = get_padded_bbox(rotated_landmarks, image.shape)
 
-    x_start, y_start, x_end, y_end = get_padded_bbox(rotated_landmarks, rotated_image.shape)
-    cropped = rotated_image[y_start:y_end, x_start:x_end]
-    cropped_landmarks = rotated_landmarks - [x_start, y_start]
+    # Warp only the crop window instead of rotating the full image and slicing
+    cropped = warp_crop(image, M, (x_start, y_start, x_end, y_end), flags=cv2.INTER_LINEAR,
+                        borderValue=(224, 224, 224))
+    cropped_landmarks = rotated_landmarks - [x_start, y_start]  # Shift landmarks to cropped coordinates
 
     if return_crop_box:
         return cropped, cropped_landmarks, M, (x_start, y_start, x_end, y_end)
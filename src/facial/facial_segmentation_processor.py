@@ -1,11 +1,12 @@
 from src.facial.facial_processing.face_segmentation_config import SegmentationConfig
-from src.facial.facial_processing.face_alignment_utils import rotate_and_crop_face
+from src.facial.facial_processing.face_alignment_utils import rotate_and_crop_face, warp_crop
 import cv2
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from src.facial.image_generator import ImageGenerator
-from src.facial.face_schema import LandmarkPoint
+from src.facial.schemas import LandmarkPoint
 from src.core.base64_utils import decode_image, decode_segmentation_map
+from src.facial.utils import landmarks_to_array
 from src.core.utils import logger
 from src.core.exceptions import NoFaceDetectedError, InvalidImageError, ProcessingError
 class FacialSegmentationProcessor:
@@ -24,14 +25,15 @@ class FacialSegmentationProcessor:
     
     # ========== CORE PROCESSING METHODS ==========
 
-    async def process_image(self, image_base64: str, segmentation_map_base64: str, landmarks: List[LandmarkPoint]) -> Tuple[str, Dict]:
+    async def process_image(self, image_base64: Union[str, bytes], segmentation_map_base64: Union[str, bytes],
+                            landmarks: Union[List[LandmarkPoint], np.ndarray]) -> Tuple[str, Dict]:
         """
         Process image with improved error handling and dependency injection.
         
         Args:
-            image_base64: Base64 encoded image
-            segmentation_map_base64: Base64 encoded segmentation map
-            landmarks: List of facial landmark points
+            image_base64: Base64 encoded image, or its already-decoded bytes
+            segmentation_map_base64: Base64 encoded segmentation map, or its already-decoded bytes
+            landmarks: Facial landmark points, as a list or an (N, 2) array
             
         Returns:
             Tuple of (generated_output, contours)
@@ -47,8 +49,11 @@ class FacialSegmentationProcessor:
             segmentation_map = decode_segmentation_map(segmentation_map_base64)
             
             # Validate landmarks
-            if not landmarks or len(landmarks) == 0:
+            if landmarks is None or len(landmarks) == 0:
                 raise NoFaceDetectedError("No face detected in the image")
+            
+            # Convert once; every later step works on the array
+            landmarks = landmarks_to_array(landmarks)
         
             # Process face regions
             image_shape, contours, processed_image = self.process_face_regions(image, segmentation_map, landmarks)
@@ -70,7 +75,7 @@ class FacialSegmentationProcessor:
         
     def process_face_regions(self, original_image: np.ndarray, 
                            segmentation_map: np.ndarray, 
-                           landmarks_list: List[LandmarkPoint]) -> Tuple[Tuple[int, int], any
+                           landmarks: np.ndarray) -> Tuple[Tuple[int, int], any
                                                                          , np.ndarray]:
         """
         Main processing method that subdivides face regions and applies overlays.
@@ -78,7 +83,7 @@ class FacialSegmentationProcessor:
         Args:
             original_image: Input face image (H, W, 3)
             segmentation_map: Segmentation mask (H, W, 3)
-            landmarks_list: List of facial landmarks with 'x', 'y' coordinates
+            landmarks: Facial landmarks as an (N, 2) float32 array
             
         Returns:
             Tuple containing:
@@ -92,11 +97,11 @@ class FacialSegmentationProcessor:
         
         # Apply rotation and cropping
         cropped_image, cropped_seg_map, cropped_landmarks = self._apply_rotation_and_crop(
-            original_image, segmentation_map, landmarks_list)
+            original_image, segmentation_map, landmarks)
         
         # Process regions and get both result image and region data
         contours_dict = self._process_subdivided_regions(
-            cropped_image, cropped_seg_map, landmarks_list)
+            cropped_image, cropped_seg_map, landmarks)
         
         return cropped_image.shape[:2], contours_dict, cropped_image
     
@@ -114,26 +119,14 @@ class FacialSegmentationProcessor:
     
     def _apply_rotation_and_crop(self, image: np.ndarray, 
                                segmentation: np.ndarray, 
-                               landmarks_list: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+                               landmarks: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Apply face alignment rotation and cropping."""
-        img_h, img_w = image.shape[:2]
-        
-        # Convert landmarks to numpy array
-        landmarks_np = np.array([
-            [pt.x, pt.y] for pt in landmarks_list
-        ], dtype=np.float32)
-        
         # Apply rotation and cropping
         cropped_image, cropped_landmarks, rot_mat, crop_box = rotate_and_crop_face(
-            image, landmarks_np, return_crop_box=True)
+            image, landmarks, return_crop_box=True)
         
-        # Apply same transformation to segmentation map
-        rotated_seg_map = cv2.warpAffine(
-            segmentation, rot_mat, (img_w, img_h), 
-            flags=cv2.INTER_NEAREST)
-        
-        x1, y1, x2, y2 = crop_box
-        cropped_seg_map = rotated_seg_map[y1:y2, x1:x2]
+        # Apply same transformation to segmentation map, warping only the crop
+        cropped_seg_map = warp_crop(segmentation, rot_mat, crop_box, flags=cv2.INTER_NEAREST)
         
         return cropped_image, cropped_seg_map, cropped_landmarks
     
@@ -185,7 +178,7 @@ class FacialSegmentationProcessor:
         return main_contour, bbox, (cx, cy)
     
     def _calculate_face_boundaries(self, face_mask: np.ndarray, 
-                                 landmarks_list: List[Dict]) -> Dict:
+                                 landmarks: np.ndarray) -> Dict:
         """Calculate comprehensive face boundaries and landmarks."""
         contour, bbox, centroid = self._analyze_face_contour(face_mask)
         if contour is None:
@@ -207,20 +200,15 @@ class FacialSegmentationProcessor:
         }
         
         # Add landmark-based boundaries
-        if landmarks_list:
-            landmarks_array = np.array([
-                [pt.x, pt.y] for pt in landmarks_list
-            ], dtype=np.float32)
+        if landmarks is not None and len(landmarks) >= 48:  # Ensure we have eye landmarks
+            left_eye_points = landmarks[self.config.left_eye_indices]
+            right_eye_points = landmarks[self.config.right_eye_indices]
             
-            if len(landmarks_array) >= 48:  # Ensure we have eye landmarks
-                left_eye_points = landmarks_array[self.config.left_eye_indices]
-                right_eye_points = landmarks_array[self.config.right_eye_indices]
-                
-                boundaries['left_eye_center'] = left_eye_points.mean(axis=0).astype(int)
-                boundaries['right_eye_center'] = right_eye_points.mean(axis=0).astype(int)
-                boundaries['eye_level'] = int(
-                    (boundaries['left_eye_center'][1] + boundaries['right_eye_center'][1]) / 2
-                )
+            boundaries['left_eye_center'] = left_eye_points.mean(axis=0).astype(int)
+            boundaries['right_eye_center'] = right_eye_points.mean(axis=0).astype(int)
+            boundaries['eye_level'] = int(
+                (boundaries['left_eye_center'][1] + boundaries['right_eye_center'][1]) / 2
+            )
         
         return boundaries
     
@@ -389,9 +377,9 @@ class FacialSegmentationProcessor:
     # ========== SUBDIVISION ORCHESTRATION ==========
     
     def _subdivide_main_face_region(self, region1_mask: np.ndarray, 
-                                  landmarks_list: List[Dict]) -> Tuple[Dict, np.ndarray]:
+                                  landmarks: np.ndarray) -> Tuple[Dict, np.ndarray]:
         """Subdivide main face region into sub-regions."""
-        boundaries = self._calculate_face_boundaries(region1_mask, landmarks_list)
+        boundaries = self._calculate_face_boundaries(region1_mask, landmarks)
         
         # Find sub-regions
         forehead_mask = self._find_forehead_region(region1_mask, boundaries)
@@ -431,13 +419,8 @@ class FacialSegmentationProcessor:
         # Get the largest contour
         largest_contour = max(contours, key=cv2.contourArea)
         
-        # Convert contour points to list format
-        points = []
-        for point in largest_contour:
-            x, y = point[0]
-            points.append([int(x), int(y)])
-        
-        return points
+        # Convert the (N, 1, 2) contour to [[x, y], ...] in one C-level pass
+        return largest_contour.reshape(-1, 2).tolist()
     
     def _get_region_centroid(self, mask: np.ndarray) -> Optional[List[int]]:
         """Get centroid of a region mask."""
@@ -617,7 +600,7 @@ class FacialSegmentationProcessor:
     
     def _process_subdivided_regions(self, original_image: np.ndarray, 
                               segmentation_map: np.ndarray, 
-                              landmarks_list: List[Dict]) -> Tuple[np.ndarray, Dict]:
+                              landmarks: np.ndarray) -> Tuple[np.ndarray, Dict]:
         """Process all subdivided regions and apply overlays."""
         unique_colors = self._get_unique_colors(segmentation_map)
         result_image = original_image.copy()
@@ -639,7 +622,7 @@ class FacialSegmentationProcessor:
         # Process main face subdivisions
         logger.debug(f"🔍 Processing Region 1 (main face)")
         region1_mask = self._create_clean_mask(segmentation_map, region_1_color)
-        subdivisions, main_face_mask = self._subdivide_main_face_region(region1_mask, landmarks_list)
+        subdivisions, main_face_mask = self._subdivide_main_face_region(region1_mask, landmarks)
         
         # Apply overlays for subdivisions and extract contour data
         for region_name, mask_obj in subdivisions.items():
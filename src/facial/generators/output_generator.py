@@ -8,7 +8,7 @@ import cv2
 import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
 from typing import List, Dict, Tuple, Optional
-from src.facial.face_schema import MaskContours
+from src.facial.schemas import MaskContours
 
 class OutputGenerator(ABC):
     """Abstract base class for different output formats."""
@@ -5,9 +5,9 @@ PNG output generator for contours with optional background image.
 import base64
 import cv2
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import Dict, Tuple, Optional
 from src.facial.generators.output_generator import OutputGenerator
-from src.facial.face_schema import MaskContours
+from src.facial.schemas import MaskContours
 from src.facial.exceptions import ProcessingError
 
 
@@ -26,6 +26,17 @@ class PNGGenerator(OutputGenerator):
         }
         self.default_color = (0, 0, 0)  # Black
         self.contour_thickness = 2
+        
+        # Region label style
+        self.label_font = cv2.FONT_HERSHEY_SIMPLEX
+        self.label_font_scale = 0.8
+        self.label_thickness = 2
+        self.label_color = (255, 255, 255)  # White
+        # Text size depends only on the label and style, so measure the
+        # known region labels once
+        self.label_sizes = {
+            region_id: self._measure_label(str(region_id)) for region_id in self.region_colors
+        }
 
     def generate(self, image_shape: Tuple[int, int], contours: MaskContours, 
                  processed_image: Optional[np.ndarray] = None) -> str:
@@ -78,41 +89,35 @@ class PNGGenerator(OutputGenerator):
             cv2.drawContours(image, [contour_np], -1, color, self.contour_thickness)
             
             # Add region number label
-            self._add_region_label(image, contour, region_id)
+            self._add_region_label(image, contour_np, region_id)
+
+    def _measure_label(self, text: str) -> Tuple[int, int]:
+        """Return the (width, height) of a label in the label style."""
+        size, _ = cv2.getTextSize(text, self.label_font, self.label_font_scale, self.label_thickness)
+        return size
 
-    def _add_region_label(self, image: np.ndarray, contour: List[List[int]], region_id: int) -> None:
+    def _add_region_label(self, image: np.ndarray, contour_np: np.ndarray, region_id: int) -> None:
         """Add region number label at the centroid of the contour."""
         try:
-            # Calculate centroid
-            contour_np = np.array(contour)
-            M = cv2.moments(contour_np)
-            
-            if M["m00"] != 0:
-                cx = int(M["m10"] / M["m00"])
-                cy = int(M["m01"] / M["m00"])
-            else:
-                # Fallback to average of points
-                cx = int(np.mean(contour_np[:, 0]))
-                cy = int(np.mean(contour_np[:, 1]))
+            # Centroid of the contour points, as in the JSON output
+            cx, cy = contour_np.mean(axis=0).astype(int).tolist()
             
             # Adjust position for region 4 (special case)
             if region_id == 4:
                 cx += 160
                 cy += 0
             
-            # Draw text
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            font_scale = 0.8
-            thickness = 2
-            text_color = (255, 255, 255)  # White
-            
             # Get text size for centering
-            (text_width, text_height), _ = cv2.getTextSize(str(region_id), font, font_scale, thickness)
+            text = str(region_id)
+            text_size = self.label_sizes.get(region_id)
+            if text_size is None:
+                text_size = self._measure_label(text)
+            text_width, text_height = text_size
             
             # Draw text centered
-            cv2.putText(image, str(region_id), 
+            cv2.putText(image, text, 
                        (cx - text_width // 2, cy + text_height // 2),
-                       font, font_scale, text_color, thickness)
+                       self.label_font, self.label_font_scale, self.label_color, self.label_thickness)
                        
         except Exception as e:
             # If label drawing fails, continue without it
@@ -1,13 +1,20 @@
-import base64
 import cv2
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import List, Dict, Tuple, Optional
-import xml.etree.ElementTree as ET
+from typing import List, Dict, Tuple, Optional, Union
+from src.core.base64_utils import b64encode
 from src.facial.generators.output_generator import OutputGenerator
 from src.facial.style_config import StyleConfig, DefaultStyleConfig
-from src.facial.face_schema import MaskContours
+from src.facial.schemas import MaskContours
 from src.facial.exceptions import ProcessingError
+
+try:
+    # libxml2-backed serializer; the stdlib API is a drop-in fallback
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+
 class SVGGenerator(OutputGenerator):
     """SVG output generator for contours with optional background image and improved style configuration."""
 
@@ -61,9 +68,10 @@ class SVGGenerator(OutputGenerator):
     def _add_background_image(self, svg_root: ET.Element, processed_image: np.ndarray, 
                             image_shape: Tuple[int, int]) -> None:
         """Add the processed image as background to the SVG."""
-        # Encode the processed image to PNG format
-        _, img_encoded = cv2.imencode('.png', processed_image)
-        img_base64 = base64.b64encode(img_encoded).decode('utf-8')
+        # Encode the processed image to PNG format; fast compression is enough
+        # for an embedded background
+        _, img_encoded = cv2.imencode('.png', processed_image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        img_base64 = b64encode(img_encoded).decode('ascii')
         
         # Create image element and add it as the first child (background)
         ET.SubElement(svg_root, "image", {
@@ -78,7 +86,7 @@ class SVGGenerator(OutputGenerator):
     def _add_regions_to_svg(self, svg_root: ET.Element, contours: MaskContours) -> None:
         """Add all contours with contour data and their labels to the SVG."""
         for region_id, contour in contours.items():
-            if not contour or len(contour) < 3:
+            if len(contour) < 3:
                 continue
 
             path_data = self._create_path_data(contour)
@@ -104,42 +112,31 @@ class SVGGenerator(OutputGenerator):
                     "class": f"region-label-{region_id}"
                 }).text = str(region_id)
 
-    def _create_path_data(self, contour: List[List[int]]) -> str:
+    def _create_path_data(self, contour: Union[List[List[int]], np.ndarray]) -> str:
         """
         Create SVG path data from contour points.
         
         Args:
-            contour: List of [x, y] coordinate pairs
+            contour: [x, y] coordinate pairs, as a list or an (N, 2) array
             
         Returns:
             SVG path data string
         """
-        if not contour or len(contour) == 0:
+        if len(contour) == 0:
             return ""
         
-        # Start with Move command to first point
-        path_data = f"M{contour[0][0]},{contour[0][1]}"
-        
-        # Add Line commands for remaining points
-        for point in contour[1:]:
-            path_data += f" L{point[0]},{point[1]}"
+        # Unpack arrays to native ints in one pass rather than per-element indexing
+        points = contour.reshape(-1, 2).tolist() if isinstance(contour, np.ndarray) else contour
         
-        # Close the path
-        path_data += " Z"
-        return path_data
+        # Move to the first point, draw lines through the rest, close the path.
+        # A list comprehension joined with " L" skips both the points[1:] copy
+        # and the generator frame
+        return "M" + " L".join([f"{x},{y}" for x, y in points]) + " Z"
     
     def _compute_centroid(self, contour: List[List[int]]) -> Tuple[int, int]:
-        """Compute the centroid of a polygon given as a list of points."""
-        contour_np = np.array(contour)
-        M = cv2.moments(contour_np)
-        if M["m00"] != 0:
-            cx = int(M["m10"] / M["m00"])
-            cy = int(M["m01"] / M["m00"])
-        else:
-            # fallback to average of points
-            cx = int(np.mean(contour_np[:, 0]))
-            cy = int(np.mean(contour_np[:, 1]))
-        return cx, cy
+        """Compute the label position of a polygon as the mean of its points."""
+        cx, cy = np.asarray(contour, dtype=np.float64).mean(axis=0)
+        return int(cx), int(cy)
 
     def _create_path_element(self, svg_root: ET.Element, path_data: str, region_id: int) -> None:
         """Create a path element for a region and add it to the SVG."""
@@ -163,6 +160,6 @@ class SVGGenerator(OutputGenerator):
 
     def _encode_svg(self, svg_root: ET.Element) -> str:
         """Encode the SVG element to a base64 string."""
-        svg_string = ET.tostring(svg_root, encoding="utf-8").decode("utf-8")
-        return base64.b64encode(svg_string.encode("utf-8")).decode("utf-8")
+        # tostring already returns UTF-8 bytes; encode them directly
+        return b64encode(ET.tostring(svg_root, encoding="utf-8")).decode("ascii")
 
@@ -9,7 +9,7 @@ from generators.svg_generator import SVGGenerator
 from generators.png_generator import PNGGenerator
 from generators.json_generator import JSONGenerator
 from style_config import StyleConfig, DefaultStyleConfig
-from face_schema import MaskContours
+from schemas import MaskContours
 from exceptions import InvalidInputError, ProcessingError
 
 class ImageGenerator:
@@ -90,7 +90,8 @@ class ImageGenerator:
         
         return generator_class()
 
-    def _validate_inputs(self, image_shape: Tuple[int, int], contours: MaskContours) -> bool:
+    @staticmethod
+    def _validate_inputs(image_shape: Tuple[int, int], contours: MaskContours) -> bool:
         """
         Validate input parameters.
         
@@ -101,10 +102,10 @@ class ImageGenerator:
         Returns:
             True if valid, False otherwise
         """
-        if not image_shape or len(image_shape) != 2:
-            return False
-        if image_shape[0] <= 0 or image_shape[1] <= 0:
-            return False
-        if not isinstance(contours, dict):
-            return False
-        return True
+        return bool(
+            isinstance(contours, dict)
+            and image_shape
+            and len(image_shape) == 2
+            and image_shape[0] > 0
+            and image_shape[1] > 0
+        )
@@ -2,9 +2,10 @@
 Database models for facial processing.
 """
 
+import base64
 from datetime import datetime
-from typing import Optional, Dict, Any
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, CheckConstraint
+from typing import Optional, Dict, Any, Tuple
+from sqlalchemy import Column, BigInteger, Integer, String, Text, DateTime, ForeignKey, JSON, LargeBinary, CheckConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.core.models import Base
@@ -17,11 +18,28 @@ class Cache(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     input_hash = Column(String(64), unique=True, index=True, nullable=False)
+    image_phash = Column(BigInteger, index=True, nullable=True)  # 64-bit image pHash as signed int8
     result = Column(JSON, nullable=False)
+    svg = Column(LargeBinary, nullable=True)  # Raw SVG document, kept out of the JSON result
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationship to jobs that reference this cache entry
     jobs = relationship("Job", back_populates="cache_entry")
+    
+    @staticmethod
+    def split_result(result: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        """Separate the base64 SVG from a result so it can be stored as raw bytes."""
+        result = dict(result)
+        svg = result.pop("svg", None)
+        return result, base64.b64decode(svg) if svg else None
+    
+    @property
+    def full_result(self) -> Dict[str, Any]:
+        """Stored result with the SVG re-attached in its base64 API form."""
+        result = dict(self.result)
+        if self.svg is not None:
+            result["svg"] = base64.b64encode(self.svg).decode("ascii")
+        return result
 
 
 class Job(Base):
@@ -52,7 +70,7 @@ class Job(Base):
             "error_message": self.error_message,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "result": self.cache_entry.result if self.cache_entry else None
+            "result": self.cache_entry.full_result if self.cache_entry else None
         }
     
     def __repr__(self) -> str:
@@ -1,92 +1,174 @@
-import base64
-import hashlib
-from typing import List, Dict, Any, Optional
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Any, Optional, Union
 import cv2
 import numpy as np
-from src.core.database import DatabaseService
-from src.facial.face_schema import LandmarkPoint
-from src.core.utils import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from src.core.base64_utils import decode_image_for_phash
+from src.facial.service import DatabaseService
+from src.facial.schemas import LandmarkPoint
+from src.facial.performance import run_in_threadpool
+from src.facial.utils import landmarks_to_array
+from src.core.utils import logger, log_error
+
+try:
+    # Faster digest for the undecodable-image fallback
+    from blake3 import blake3 as _content_hash
+except ImportError:
+    from hashlib import sha256 as _content_hash
+
+_HASH_CHUNK_CHARS = 1 << 20
+
+
+def _dct_basis(size: int, rows: int) -> np.ndarray:
+    """First rows of the orthonormal DCT-II matrix (same scaling as cv2.dct)."""
+    k = np.arange(rows)[:, None]
+    n = np.arange(size)[None, :]
+    basis = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2.0 / size)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+_DCT_LOW = _dct_basis(32, 8)
+
 
 class PerceptualHashCache:
     """Cache system using perceptual hashing for images."""
     
-    def __init__(self, db_service: DatabaseService):
-        self.db_service = db_service
+    # Pending cache writes keyed by input hash, shared across instances so
+    # concurrent submits of the same content wait on a single insert
+    _inflight: Dict[str, "asyncio.Future[int]"] = {}
     
-    async def get_cached_result(self, image_base64: str, landmarks: List[LandmarkPoint] = None, 
-                               segmentation_map_base64: str = None) -> Optional[Dict[str, Any]]:
-        """Try to get cached result based on perceptual similarity."""
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        # Shared across requests; each operation opens its own session
+        self.session_factory = session_factory
+    
+    @asynccontextmanager
+    async def _db_service(self) -> AsyncIterator[DatabaseService]:
+        """Yield a database service bound to a short-lived session."""
+        async with self.session_factory() as session:
+            yield DatabaseService(session)
+    
+    async def get_cached_result(self, image_base64: Union[str, bytes], landmarks: Union[List[LandmarkPoint], np.ndarray] = None, 
+                               segmentation_map_base64: Union[str, bytes] = None) -> Optional[Dict[str, Any]]:
+        """Try to get cached result based on perceptual similarity.
         
-        p_hash = self._compute_perceptual_hash(image_base64)
+        Image inputs may be base64 strings or already-decoded bytes.
+        """
         
-        input_data = {"image_hash": p_hash}
+        input_data = await self._build_input_data(image_base64, landmarks, segmentation_map_base64)
         
-        if landmarks:
-            input_data["landmarks"] = [{"x": lm.x, "y": lm.y} for lm in landmarks]
-            
-        if segmentation_map_base64:
-            seg_hash = self._compute_perceptual_hash(segmentation_map_base64)
-            input_data["segmentation_map_hash"] = seg_hash
-                
-        result = await self.db_service.get_cached_result(input_data)
+        async with self._db_service() as db_service:
+            result = await db_service.get_cache_result(self._input_hash(input_data))
         
         return result
     
-    async def store_result(self, image_base64: str, result: Dict[str, Any], 
-                          landmarks: List[LandmarkPoint] = None, 
-                          segmentation_map_base64: str = None) -> int:
+    async def store_result(self, image_base64: Union[str, bytes], result: Dict[str, Any], 
+                          landmarks: Union[List[LandmarkPoint], np.ndarray] = None, 
+                          segmentation_map_base64: Union[str, bytes] = None) -> int:
         """Cache result with perceptual hash and return cache ID."""
         
-        p_hash = self._compute_perceptual_hash(image_base64)
-        
-        input_data = {"image_hash": p_hash}
-        
-        if landmarks:
-            input_data["landmarks"] = [{"x": lm.x, "y": lm.y} for lm in landmarks]
-            
-        if segmentation_map_base64:
-            seg_hash = self._compute_perceptual_hash(segmentation_map_base64)
-            input_data["segmentation_map_hash"] = seg_hash
+        input_data = await self._build_input_data(image_base64, landmarks, segmentation_map_base64)
+        input_hash = self._input_hash(input_data)
         
+        pending = self._inflight.get(input_hash)
+        if pending is not None:
+            # Identical content is already being written; reuse its cache ID
+            return await asyncio.shield(pending)
         
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[input_hash] = future
         try:
-            cache_id = await self.db_service.store_cached_result(input_data, result)
+            async with self._db_service() as db_service:
+                cache_id = await db_service.store_cache_result(
+                    input_hash, result, self._phash_to_int(input_data["image_hash"])
+                )
+            future.set_result(cache_id)
             return cache_id
         except Exception as e:
-            logger.error(f"Error in store_result: {e}")
-            import traceback
-            traceback.print_exc()
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures don't warn on GC
+            future.exception()
+            log_error("Error in store_result", e)
             raise
+        finally:
+            del self._inflight[input_hash]
     
-    def _compute_perceptual_hash(self, image_base64: str) -> str:
+    async def _build_input_data(self, image_base64: Union[str, bytes], landmarks: Optional[Union[List[LandmarkPoint], np.ndarray]],
+                                segmentation_map_base64: Optional[Union[str, bytes]]) -> Dict[str, Any]:
+        """Describe the input by its perceptual hashes and landmarks."""
+        # Decoding and DCT are CPU-bound; hash both images off the event loop
+        hash_jobs = [run_in_threadpool(self._compute_perceptual_hash, image_base64)]
+        if segmentation_map_base64:
+            hash_jobs.append(run_in_threadpool(self._compute_perceptual_hash, segmentation_map_base64))
+        hashes = await asyncio.gather(*hash_jobs)
+        
+        input_data = {"image_hash": hashes[0]}
+        
+        if landmarks is not None and len(landmarks):
+            # One digest over the packed coordinates instead of a dict per point
+            input_data["landmarks"] = _content_hash(landmarks_to_array(landmarks).tobytes()).hexdigest()
+            
+        if segmentation_map_base64:
+            input_data["segmentation_map_hash"] = hashes[1]
+        
+        return input_data
+    
+    @staticmethod
+    def _phash_to_int(p_hash: str) -> Optional[int]:
+        """Pack a 16-digit pHash into a signed 64-bit int for BIGINT storage."""
+        if len(p_hash) != 16:
+            # Fallback content hashes are not perceptual; nothing to store
+            return None
+        return int.from_bytes(bytes.fromhex(p_hash), "big", signed=True)
+    
+    @staticmethod
+    def _input_hash(input_data: Dict[str, Any]) -> str:
+        """Derive the cache key for the hashed input description."""
+        # Every field is already a hex digest; join them instead of JSON-encoding
+        key = "|".join(f"{name}={input_data[name]}" for name in sorted(input_data))
+        return _content_hash(key.encode()).hexdigest()
+    
+    @staticmethod
+    def _fallback_hash(image_data: Union[str, bytes]) -> str:
+        """Content hash used when the image cannot be decoded."""
+        if not isinstance(image_data, str):
+            return _content_hash(image_data).hexdigest()
+        
+        # Encode in slices rather than copying the whole payload up front;
+        # the digest is identical to hashing the full UTF-8 encoding
+        digest = _content_hash()
+        for start in range(0, len(image_data), _HASH_CHUNK_CHARS):
+            digest.update(image_data[start:start + _HASH_CHUNK_CHARS].encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _compute_perceptual_hash(self, image_base64: Union[str, bytes]) -> str:
         """Compute perceptual hash of an image using pHash algorithm."""
         try:
-            img_data = base64.b64decode(image_base64)
-            nparr = np.frombuffer(img_data, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
+            # The hash only needs 32x32, so let the codec downscale while decoding
+            img = decode_image_for_phash(image_base64, min_size=32)
             
             if img is None:
-                fallback_hash = hashlib.sha256(image_base64.encode('utf-8')).hexdigest()
+                fallback_hash = self._fallback_hash(image_base64)
                 logger.error(f"Image decode failed, using fallback hash: {fallback_hash[:16]}...")
                 return fallback_hash
             
             img = cv2.resize(img, (32, 32))
-            dct = cv2.dct(np.float32(img))
-            dct_low = dct[:8, :8]
-            med = np.median(dct_low)
-            hash_bits = (dct_low > med).flatten()
-            
-            hash_hex = ""
-            for i in range(0, len(hash_bits), 4):
-                value = 0
-                for j in range(4):
-                    if i + j < len(hash_bits) and hash_bits[i + j]:
-                        value += 1 << j
-                hash_hex += hex(value)[2:]
+            # Only the 8x8 low-frequency block is used, so project onto
+            # those basis rows instead of running the full 32x32 DCT
+            dct_low = _DCT_LOW @ np.float32(img) @ _DCT_LOW.T
+            hash_coeffs = dct_low.ravel()
+            # Lower median by selection; for a strict '>' threshold over 64
+            # values this picks the same bits as np.median
+            med = np.partition(hash_coeffs, 31)[31]
+            hash_bits = hash_coeffs > med
             
-            return hash_hex
+            # One hex digit per 4 bits, least significant bit first; swap the
+            # nibbles of each little-endian packed byte to keep that order
+            packed = np.packbits(hash_bits, bitorder='little')
+            return ((packed << 4) | (packed >> 4)).tobytes().hex()
         except Exception as e:
             logger.error(f"Error computing perceptual hash: {e}")
-            fallback_hash = hashlib.sha256(image_base64.encode('utf-8')).hexdigest()
+            fallback_hash = self._fallback_hash(image_base64)
             logger.debug(f"Using fallback hash: {fallback_hash[:16]}...")
             return fallback_hash
\ No newline at end of file
@@ -2,19 +2,30 @@
 Facial processing router - simplified version for testing.
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends, Request
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
 from typing import Dict, Any, Optional, Union
 import time
-import uuid
 
 from src.core.database import SessionDep
+from src.core.exceptions import NotFoundException
 from src.core.utils import log_request, log_response, log_job_status, logger
 from src.auth.dependencies import get_current_user, get_optional_current_user
 from src.auth.models import User
+from src.facial.constants import JobStatus
+from src.facial.dependencies import get_db_service
+from src.facial.schemas import JobStatusResponse
+from src.facial.service import DatabaseService
 from src.middleware.rate_limiting import processing_rate_limit, status_rate_limit
 
 router = APIRouter(prefix="/api/v1", tags=["facial-processing"])
 
+_JOB_STATUS_MESSAGES = {
+    JobStatus.QUEUED: "Job is queued for processing",
+    JobStatus.PROCESSING: "Job is being processed",
+    JobStatus.COMPLETED: "Job completed successfully",
+    JobStatus.FAILED: "Job failed",
+}
+
 
 @router.get("/health")
 async def health_check():
@@ -22,19 +33,34 @@ async def health_check():
     return {"status": "healthy", "service": "facial-processing"}
 
 
-@router.get("/status/{job_id}")
+# Documented via responses= rather than response_model so the returned dict
+# is not re-validated on every poll
+@router.get("/status/{job_id}", responses={200: {"model": JobStatusResponse}})
 @status_rate_limit()
 async def get_job_status(
     job_id: str,
     request: Request,
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db_service: Optional[DatabaseService] = Depends(get_db_service)
 ):
     """Get job status - simplified version."""
     logger.info(f"Job status requested for {job_id} by user {current_user.username}")
+    
+    job_status = "completed"
+    if db_service is not None:
+        job_status = await db_service.get_job_status(job_id)
+        if job_status is None:
+            raise NotFoundException(f"Job {job_id} not found")
+    
+    if job_status in (JobStatus.QUEUED, JobStatus.PROCESSING):
+        # Point pollers at the canonical status URL for this job
+        response.headers["Location"] = str(request.url_for("get_job_status", job_id=job_id))
+    
     return {
         "job_id": job_id,
-        "status": "completed",
-        "message": "Service is running - full functionality will be implemented"
+        "status": job_status,
+        "message": _JOB_STATUS_MESSAGES.get(job_status, f"Job is {job_status}")
     }
 
 
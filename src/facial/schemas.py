@@ -2,7 +2,7 @@
 Pydantic schemas for facial processing API.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, List, Optional, Any, Tuple
 
 # Type alias for mask contours
@@ -11,6 +11,8 @@ MaskContours = Dict[int, List[Tuple[int, int]]]
 
 class LandmarkPoint(BaseModel):
     """Facial landmark point."""
+    model_config = ConfigDict(frozen=True)
+    
     x: float
     y: float
 
@@ -7,7 +7,7 @@ import json
 import hashlib
 from datetime import datetime, timedelta
 from sqlalchemy import select, update, delete
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.database import SessionDep
@@ -73,28 +73,26 @@ class DatabaseService:
     
     async def get_job_with_result(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get job with result data from cache."""
+        jobs = await self.get_jobs_with_results([job_id])
+        return jobs.get(job_id)
+    
+    async def get_jobs_with_results(self, job_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several jobs with their cached results in a single round trip."""
+        if not job_ids:
+            return {}
+        
         try:
+            # LEFT OUTER JOIN on the cache table instead of a second SELECT per job
             result = await self.session.execute(
                 select(Job)
-                .options(selectinload(Job.cache_entry))
-                .where(Job.id == job_id)
+                .options(joinedload(Job.cache_entry))
+                .where(Job.id.in_(job_ids))
             )
-            job = result.scalar_one_or_none()
-            
-            if not job:
-                return None
-            
-            job_data = job.to_dict()
-            
-            # Add result data if available
-            if job.cache_entry:
-                job_data["result"] = job.cache_entry.result
-            
-            return job_data
+            return {job.id: job.to_dict() for job in result.scalars().unique()}
             
         except SQLAlchemyError as e:
-            logger.error(f"Database error getting job: {e}")
-            raise DatabaseException(f"Failed to get job: {str(e)}")
+            logger.error(f"Database error getting jobs: {e}")
+            raise DatabaseException(f"Failed to get jobs: {str(e)}")
     
     async def get_job_status(self, job_id: str) -> Optional[str]:
         """Get job status."""
@@ -113,7 +111,8 @@ class DatabaseService:
     async def store_cache_result(
         self, 
         input_hash: str, 
-        result: Dict[str, Any]
+        result: Dict[str, Any],
+        image_phash: Optional[int] = None
     ) -> int:
         """Store processing result in cache."""
         try:
@@ -122,20 +121,23 @@ class DatabaseService:
                 select(Cache).where(Cache.input_hash == input_hash)
             )
             cache_entry = result_query.scalar_one_or_none()
+            payload, svg = Cache.split_result(result)
             
             if cache_entry:
                 # Update existing cache entry
                 await self.session.execute(
                     update(Cache)
                     .where(Cache.input_hash == input_hash)
-                    .values(result=result)
+                    .values(result=payload, svg=svg, image_phash=image_phash)
                 )
                 cache_id = cache_entry.id
             else:
                 # Create new cache entry
                 cache_entry = Cache(
                     input_hash=input_hash,
-                    result=result
+                    result=payload,
+                    svg=svg,
+                    image_phash=image_phash
                 )
                 self.session.add(cache_entry)
                 await self.session.flush()  # Get the ID
@@ -159,7 +161,7 @@ class DatabaseService:
             cache_entry = result.scalar_one_or_none()
             
             if cache_entry:
-                return cache_entry.result
+                return cache_entry.full_result
             
             return None
             
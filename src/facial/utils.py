@@ -2,10 +2,11 @@
 Utility functions for facial processing.
 """
 
-import base64
+import json
 import numpy as np
 import cv2
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
+from src.core.base64_utils import b64decode
 from src.facial.schemas import LandmarkPoint, MaskContours
 from src.facial.exceptions import InvalidImageException, NoFaceDetectedException
 
@@ -18,7 +19,7 @@ def decode_image(image_data: str) -> np.ndarray:
             image_data = image_data.split(',')[1]
         
         # Decode base64
-        image_bytes = base64.b64decode(image_data)
+        image_bytes = b64decode(image_data)
         
         # Convert to numpy array
         nparr = np.frombuffer(image_bytes, np.uint8)
@@ -43,7 +44,7 @@ def decode_segmentation_map(segmentation_data: str) -> np.ndarray:
             segmentation_data = segmentation_data.split(',')[1]
         
         # Decode base64
-        map_bytes = base64.b64decode(segmentation_data)
+        map_bytes = b64decode(segmentation_data)
         
         # Convert to numpy array
         nparr = np.frombuffer(map_bytes, np.uint8)
@@ -79,11 +80,8 @@ def validate_face_mesh(landmarks: List[LandmarkPoint]) -> bool:
     return True
 
 
-def extract_result_data(result_data: Dict[str, Any]) -> Tuple[str, MaskContours]:
-    """Extract SVG and mask contours from the result data."""
-    if not result_data:
-        raise ValueError("Result data is empty")
-    
+def _extract_from_dict(result_data: Dict[str, Any]) -> Tuple[str, MaskContours]:
+    """Extract SVG and mask contours from a result dictionary."""
     svg_data = result_data.get("svg", "")
     mask_contours = result_data.get("mask_contours", {})
     
@@ -96,6 +94,32 @@ def extract_result_data(result_data: Dict[str, Any]) -> Tuple[str, MaskContours]
     return svg_data, mask_contours
 
 
+def _extract_from_json(result_data: Union[str, bytes]) -> Tuple[str, MaskContours]:
+    """Extract SVG and mask contours from a JSON-serialized result."""
+    return extract_result_data(json.loads(result_data))
+
+
+def _extract_unsupported(result_data: Any) -> Tuple[str, MaskContours]:
+    """Reject result data of an unsupported type."""
+    raise ValueError(f"Unsupported result data type: {type(result_data).__name__}")
+
+
+# Result extractors keyed by the exact type of the stored result
+_RESULT_EXTRACTORS = {
+    dict: _extract_from_dict,
+    str: _extract_from_json,
+    bytes: _extract_from_json,
+}
+
+
+def extract_result_data(result_data: Union[Dict[str, Any], str, bytes]) -> Tuple[str, MaskContours]:
+    """Extract SVG and mask contours from the result data."""
+    if not result_data:
+        raise ValueError("Result data is empty")
+    
+    return _RESULT_EXTRACTORS.get(type(result_data), _extract_unsupported)(result_data)
+
+
 def calculate_image_hash(image: np.ndarray) -> str:
     """Calculate perceptual hash for image similarity."""
     try:
@@ -122,6 +146,17 @@ def calculate_image_hash(image: np.ndarray) -> str:
         raise InvalidImageException(f"Failed to calculate image hash: {str(e)}")
 
 
+def landmarks_to_array(landmarks: Union[List[LandmarkPoint], np.ndarray]) -> np.ndarray:
+    """Convert landmarks to a contiguous (N, 2) float32 array."""
+    if isinstance(landmarks, np.ndarray):
+        return np.ascontiguousarray(landmarks, dtype=np.float32).reshape(-1, 2)
+    return np.fromiter(
+        (coord for lm in landmarks for coord in (lm.x, lm.y)),
+        dtype=np.float32,
+        count=2 * len(landmarks)
+    ).reshape(-1, 2)
+
+
 def normalize_landmarks(landmarks: List[LandmarkPoint], image_shape: Tuple[int, int]) -> List[LandmarkPoint]:
     """Normalize landmarks to image coordinates."""
     height, width = image_shape[:2]
@@ -2,6 +2,7 @@
 Main application module that defines FastAPI routes and startup/shutdown events.
 """
 
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
@@ -10,7 +11,7 @@ from slowapi.errors import RateLimitExceeded
 # Import our modules
 from src.core.config import config
 from src.core.database import create_db_and_tables
-from src.core.utils import log_startup_banner, log_processing_step
+from src.core.utils import log_startup_banner, log_processing_step, log_listener, logger
 from src.auth.router import router as auth_router
 from src.facial.router import router as facial_router
 from src.middleware.rate_limiting import limiter, rate_limit_exceeded_handler
@@ -64,6 +65,17 @@ async def startup_event():
         log_processing_step("Initializing database...")
         await create_db_and_tables()
         log_processing_step("Database initialization completed")
+        
+        # Share one perceptual hash cache across requests
+        from src.core.database import db_manager
+        from src.facial.perceptual_caching import PerceptualHashCache
+        app.state.perceptual_hash_cache = PerceptualHashCache(db_manager.session_factory)
+        
+        # Batch last-login writes off the login path
+        from src.auth.service import run_last_login_flusher
+        app.state.last_login_flusher = asyncio.create_task(
+            run_last_login_flusher(db_manager.session_factory)
+        )
     else:
         log_processing_step("Database usage is disabled")
 
@@ -72,8 +84,26 @@ async def shutdown_event():
     # Close database connections if database was used
     if config.db.use_database:
         from src.core.database import db_manager
+        from src.auth.service import flush_last_logins
+        
+        # Stop the batch writer and persist whatever it had not written yet
+        flusher = getattr(app.state, "last_login_flusher", None)
+        if flusher is not None:
+            flusher.cancel()
+            try:
+                await flusher
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                # The task died earlier; report it but still shut down cleanly
+                logger.error(f"Last-login flusher failed: {e}")
+        await flush_last_logins(db_manager.session_factory)
+        
         await db_manager.close()
         log_processing_step("Database connections closed")
+    
+    # Flush queued log records
+    log_listener.stop()
 
 @app.get("/")
 async def root():
@@ -2,19 +2,29 @@
 Rate limiting configuration using slowapi library.
 """
 
+import functools
+import math
+import time
+from typing import Dict, Tuple
+from redis.exceptions import RedisError
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request, HTTPException, status
 from src.core.config import config
+from src.core.redis_client import redis_client, redis_available, mark_redis_down, REDIS_RETRY_INTERVAL
 from src.core.utils import logger
 
 # Initialize limiter with Redis backend (fallback to memory)
 try:
-    # Try Redis first
+    # Try Redis first. The moving window is kept per key in Redis and
+    # checked/updated by one atomic Lua script, so limits hold across workers
+    # and don't allow double bursts at fixed-window boundaries
     limiter = Limiter(
         key_func=get_remote_address,
-        storage_uri="redis://localhost:6379",
+        storage_uri=config.rate_limit.redis_url,
+        strategy="moving-window",
+        in_memory_fallback_enabled=True,
         default_limits=[f"{config.rate_limit.requests_per_hour}/hour"]
     )
     logger.info("Rate limiting initialized with Redis backend")
@@ -22,6 +32,7 @@ except Exception as e:
     # Fallback to in-memory storage
     limiter = Limiter(
         key_func=get_remote_address,
+        strategy="moving-window",
         default_limits=[f"{config.rate_limit.requests_per_hour}/hour"]
     )
     logger.warning(f"Redis not available, using in-memory rate limiting: {e}")
@@ -69,3 +80,105 @@ def status_rate_limit():
 def admin_rate_limit():
     """Rate limit for admin endpoints."""
     return limiter.limit("50/hour")
+
+
+# ========== TOKEN BUCKET ==========
+# Refills continuously, so bursts up to capacity pass while the sustained
+# rate stays bounded. The refill, take and expiry run server-side in one
+# script, using Redis' clock so workers agree on elapsed time.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local refill_per_ms = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'last_ms')
+local tokens = tonumber(state[1]) or capacity
+local last = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * refill_per_ms)
+
+local retry_after_ms = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after_ms = math.ceil((1 - tokens) / refill_per_ms)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last_ms', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill_per_ms))
+return retry_after_ms
+"""
+
+# Script objects run via EVALSHA and reload the script if Redis lost it
+_token_bucket_script = redis_client.register_script(_TOKEN_BUCKET_LUA)
+
+# Per-process buckets used while Redis is unreachable: key -> (tokens, last),
+# ordered least recently used first. Bounded, since keys are client addresses
+_LOCAL_BUCKETS_MAXSIZE = 10_000
+_local_buckets: Dict[str, Tuple[float, float]] = {}
+
+
+def _take_local_token(key: str, capacity: int, refill_per_sec: float) -> int:
+    """Take a token from an in-process bucket; returns retry-after in ms (0 if allowed)."""
+    now = time.monotonic()
+    tokens, last = _local_buckets.pop(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - last) * refill_per_sec)
+    retry_after_ms = 0
+    if tokens >= 1:
+        tokens -= 1
+    else:
+        retry_after_ms = math.ceil((1 - tokens) / refill_per_sec * 1000)
+    
+    if len(_local_buckets) >= _LOCAL_BUCKETS_MAXSIZE:
+        # Drop buckets idle long enough to have refilled (the same as no entry);
+        # if none are, evict the least recently used one
+        refill_time = capacity / refill_per_sec
+        for stale_key, (_, stale_last) in list(_local_buckets.items()):
+            if len(_local_buckets) < _LOCAL_BUCKETS_MAXSIZE and now - stale_last < refill_time:
+                break
+            del _local_buckets[stale_key]
+    _local_buckets[key] = (tokens, now)
+    return retry_after_ms
+
+
+async def _take_token(key: str, capacity: int, refill_per_sec: float) -> int:
+    """Take a token from the shared bucket; returns retry-after in ms (0 if allowed)."""
+    if not redis_available():
+        return _take_local_token(key, capacity, refill_per_sec)
+    try:
+        return int(await _token_bucket_script(keys=[key], args=[capacity, refill_per_sec / 1000]))
+    except RedisError as e:
+        logger.warning(f"Redis unavailable for token bucket, using local state for "
+                       f"{REDIS_RETRY_INTERVAL:g}s: {e}")
+        mark_redis_down()
+        return _take_local_token(key, capacity, refill_per_sec)
+
+
+def token_bucket_rate_limit(scope: str):
+    """Token-bucket rate limit per client address, sized from the auth config."""
+    capacity = config.auth.rate_limit_capacity
+    refill_per_sec = config.auth.rate_limit_refill_per_sec
+    
+    def decorator(func):
+        if not config.rate_limit.enabled:
+            return func
+        
+        @functools.wraps(func)
+        async def wrapper(*args, request: Request, **kwargs):
+            key = f"tb:{scope}:{get_remote_address(request)}"
+            retry_after_ms = await _take_token(key, capacity, refill_per_sec)
+            if retry_after_ms:
+                retry_after = math.ceil(retry_after_ms / 1000)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail={
+                        "detail": "Rate limit exceeded",
+                        "error_code": "RATE_LIMIT_EXCEEDED",
+                        "rate_limit": {"limit": capacity, "remaining": 0, "retry_after": retry_after}
+                    },
+                    headers={"Retry-After": str(retry_after)}
+                )
+            return await func(*args, request=request, **kwargs)
+        
+        return wrapper
+    return decorator
+